@@ -6,6 +6,8 @@ LLM 客户端实现，负责读取统一配置并提供对话调用能力。
 import os
 import time
 import json
+import logging
+import random
 import threading
 from typing import Dict, List, Optional, Any, Generator
 from datetime import datetime
@@ -28,6 +30,9 @@ from .llm_config import (
 load_dotenv()
 logger = get_logger(__name__)
 
+# 重试等待的随机抖动比例，避免多个并发请求在同一时刻再次撞上限流
+_RETRY_JITTER_RATIO = 0.25
+
 
 def _format_missing_config_error(target_config_name: str, model_configs: List[LLMModelConfig]) -> ValueError:
     """生成带可用配置列表的缺省配置错误。"""
@@ -72,6 +77,24 @@ def _match_config_alias(config_name: Optional[str], model_configs: List[LLMModel
     return str(config_name or "").strip()
 
 
+def _preview(text: str, limit: int) -> str:
+    """截断日志预览文本，只对前 limit 个字符做处理。"""
+    return text[:limit] + "..." if len(text) > limit else text
+
+
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    """读取限流响应中的 Retry-After 秒数，缺失或非数字时返回 None。"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        value = float(headers.get("retry-after", ""))
+    except (TypeError, ValueError):
+        return None
+    return value if value >= 0 else None
+
+
 def _resolve_target_config_name(
     model: Optional[str],
     config_name: Optional[str],
@@ -188,6 +211,21 @@ class LLMClient:
             self._config = load_llm_config_from_env()
         self._circuit_breakers: Dict[str, CircuitBreaker] = {}
         self._init_circuit_breakers()
+        # 可用配置（已启用且具备 api_key/base_url）在初始化时按优先级筛好，调用时不再逐个判断
+        self._ready_models: List[LLMModelConfig] = sorted(
+            (mc for mc in self._config.models if mc.enabled and mc.api_key and mc.base_url),
+            key=lambda m: m.priority,
+            reverse=True,
+        )
+        # 归一化配置名 → 配置名索引（同名取首个，与 _match_config_alias 一致）
+        self._config_name_index: Dict[str, str] = {}
+        for mc in self._config.models:
+            normalized_name = _normalize_model_identifier(mc.name)
+            if normalized_name:
+                self._config_name_index.setdefault(normalized_name, str(mc.name or "").strip())
+        # OpenAI SDK 客户端按 (api_key, base_url, timeout) 复用，保持 HTTP 连接池
+        self._openai_clients: Dict[tuple, OpenAI] = {}
+        self._openai_clients_lock = threading.Lock()
         logger.info(f"LLM 客户端初始化完成，加载了 {len(self._config.models)} 个模型配置")
 
     def _init_circuit_breakers(self):
@@ -214,17 +252,13 @@ class LLMClient:
 
     def _get_model_configs(self, config_name: Optional[str] = None) -> List[LLMModelConfig]:
         """获取可用的模型配置列表。"""
-        matched_config_name = _match_config_alias(config_name, self._config.models)
-        configs = []
-        for mc in self._config.models:
-            if not mc.enabled or not mc.api_key or not mc.base_url:
-                continue
-            if matched_config_name and mc.name != matched_config_name:
-                continue
-            configs.append(mc)
-
-        configs.sort(key=lambda m: m.priority, reverse=True)
-        return configs
+        matched_config_name = self._config_name_index.get(_normalize_model_identifier(config_name))
+        if matched_config_name is None:
+            # 未直接命中配置名时再按底层模型别名匹配
+            matched_config_name = _match_config_alias(config_name, self._config.models)
+        if not matched_config_name:
+            return list(self._ready_models)
+        return [mc for mc in self._ready_models if mc.name == matched_config_name]
 
     def _prepare_messages(self, messages: List[Dict], mode: str = "instruct") -> List[Dict]:
         """准备消息列表，根据模式添加系统提示。"""
@@ -254,28 +288,29 @@ class LLMClient:
         logger.info(f"[LLM 呼叫] 正在连接: {config_name} | 模式: {mode}")
         logger.info(f"   模型: {model}")
         logger.info(f"   地址: {base_url}")
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
         logger.debug("-" * 20)
         logger.debug("[输入消息]:")
         for msg in messages:
             role = msg.get('role', '未知')
             content = msg.get('content', '')
-            truncated = content[:200] + "..." if len(content) > 200 else content
-            logger.debug(f"   [{role.upper()}]: {truncated}")
+            logger.debug(f"   [{role.upper()}]: {_preview(content, 200)}")
         logger.debug("-" * 20)
 
     def _log_response(self, content: str, duration: float):
         """记录响应日志。"""
+        if not logger.isEnabledFor(logging.INFO):
+            return
         logger.info(f"[输出响应] (耗时: {duration:.2f}秒):")
-        try:
-            if content.strip().startswith(("{", "[")):
-                parsed = json.loads(content)
-                logger.info(json.dumps(parsed, ensure_ascii=False, indent=2))
-            else:
-                truncated = content[:500] + "..." if len(content) > 500 else content
-                logger.info(f"   {truncated}")
-        except Exception:
-            truncated = content[:500] + "..." if len(content) > 500 else content
-            logger.info(f"   {truncated}")
+        # 完整的 JSON 美化输出只在 DEBUG 下生成，INFO 级别仅记录截断预览
+        if logger.isEnabledFor(logging.DEBUG) and content.lstrip().startswith(("{", "[")):
+            try:
+                logger.debug(json.dumps(json.loads(content), ensure_ascii=False, indent=2))
+            except Exception:
+                logger.info(f"   {_preview(content, 500)}")
+        else:
+            logger.info(f"   {_preview(content, 500)}")
         logger.info("=" * 50)
 
     def _log_error(self, error: Exception, duration: float):
@@ -290,6 +325,23 @@ class LLMClient:
             base_url = base_url.replace("/chat/completions", "")
         return base_url
 
+    def _get_openai_client(self, config: LLMModelConfig, timeout_config: TimeoutConfig) -> OpenAI:
+        """获取（或创建并缓存）指定配置的 OpenAI 兼容客户端，复用 TCP/TLS 连接。"""
+        base_url = self._normalize_base_url(config.base_url)
+        key = (config.api_key, base_url, timeout_config.total)
+        client = self._openai_clients.get(key)
+        if client is None:
+            with self._openai_clients_lock:
+                client = self._openai_clients.get(key)
+                if client is None:
+                    client = OpenAI(
+                        api_key=config.api_key,
+                        base_url=base_url,
+                        timeout=timeout_config.total
+                    )
+                    self._openai_clients[key] = client
+        return client
+
     def _call_openai(
         self,
         config: LLMModelConfig,
@@ -299,13 +351,7 @@ class LLMClient:
         max_tokens: Optional[int] = None
     ) -> str:
         """调用 OpenAI 兼容的 API。"""
-        base_url = self._normalize_base_url(config.base_url)
-
-        client = OpenAI(
-            api_key=config.api_key,
-            base_url=base_url,
-            timeout=timeout_config.total
-        )
+        client = self._get_openai_client(config, timeout_config)
 
         extra_body = {}
         if "dashscope" in config.base_url or "aliyun" in config.base_url:
@@ -330,13 +376,7 @@ class LLMClient:
         timeout_config: TimeoutConfig
     ) -> Generator[str, None, None]:
         """调用 OpenAI 兼容的 API（流式输出）。"""
-        base_url = self._normalize_base_url(config.base_url)
-
-        client = OpenAI(
-            api_key=config.api_key,
-            base_url=base_url,
-            timeout=timeout_config.total
-        )
+        client = self._get_openai_client(config, timeout_config)
 
         extra_body = {}
         if "dashscope" in config.base_url or "aliyun" in config.base_url:
@@ -351,9 +391,15 @@ class LLMClient:
             stream=True
         )
 
-        for chunk in response:
-            if chunk.choices and chunk.choices[0].delta.content:
-                yield chunk.choices[0].delta.content
+        # 调用方提前停止迭代时主动关闭流，及时把连接归还连接池
+        try:
+            for chunk in response:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            close = getattr(response, "close", None)
+            if close is not None:
+                close()
 
     def chat(
         self,
@@ -395,14 +441,14 @@ class LLMClient:
                 continue
 
             self._log_request(config.name, config.model, config.base_url, mode, processed_messages)
-            start_time = time.time()
+            start_time = time.monotonic()
 
             try:
                 content = self._call_with_retry(
                     config, processed_messages, temp, self._config.timeout, effective_max_tokens
                 )
 
-                duration = time.time() - start_time
+                duration = time.monotonic() - start_time
                 self._log_response(content, duration)
 
                 if circuit_breaker:
@@ -411,7 +457,7 @@ class LLMClient:
                 return content
 
             except Exception as e:
-                duration = time.time() - start_time
+                duration = time.monotonic() - start_time
                 self._log_error(e, duration)
 
                 if circuit_breaker:
@@ -460,7 +506,7 @@ class LLMClient:
                 continue
 
             self._log_request(config.name, config.model, config.base_url, mode, processed_messages)
-            start_time = time.time()
+            start_time = time.monotonic()
 
             try:
                 for token in self._call_openai_stream(
@@ -468,7 +514,7 @@ class LLMClient:
                 ):
                     yield token
 
-                duration = time.time() - start_time
+                duration = time.monotonic() - start_time
                 logger.info(f"[流式输出完成] 耗时: {duration:.2f}秒")
 
                 if circuit_breaker:
@@ -477,7 +523,7 @@ class LLMClient:
                 return
 
             except Exception as e:
-                duration = time.time() - start_time
+                duration = time.monotonic() - start_time
                 self._log_error(e, duration)
 
                 if circuit_breaker:
@@ -508,10 +554,17 @@ class LLMClient:
                 last_error = e
 
                 if attempt < retry_config.max_retries:
-                    delay = min(
-                        retry_config.initial_delay * (retry_config.exponential_base ** attempt),
-                        retry_config.max_delay
-                    )
+                    retry_after = (_retry_after_seconds(e) or 0.0) if isinstance(e, RateLimitError) else 0.0
+                    if retry_after > retry_config.max_delay:
+                        # 服务端要求的等待超过本地上限：不再原地等待，交由上层切换配置
+                        logger.error(
+                            f"限流要求等待 {retry_after:.1f} 秒，超过上限 {retry_config.max_delay:.1f} 秒，停止重试: {e}"
+                        )
+                        break
+                    delay = retry_config.initial_delay * (retry_config.exponential_base ** attempt)
+                    delay *= 1.0 + random.random() * _RETRY_JITTER_RATIO
+                    # 先按上限截断本地退避，再以服务端 Retry-After 为下限，避免提前重试
+                    delay = max(min(delay, retry_config.max_delay), retry_after)
                     logger.warning(
                         f"请求失败 (尝试 {attempt + 1}/{retry_config.max_retries + 1})，"
                         f"{delay:.1f} 秒后重试: {e}"
@@ -9,10 +9,20 @@ from pydantic import ValidationError
 
 from .llm_logger import get_logger
 
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
 logger = get_logger(__name__)
 
 T = TypeVar('T')
 
+# _try_fix_json 使用的修复规则，模块加载时编译一次
+_TRAILING_COMMA_OBJ_RE = re.compile(r',\s*}')
+_TRAILING_COMMA_ARR_RE = re.compile(r',\s*]')
+_KV_SPACING_RE = re.compile(r'"\s*:\s*"')
+
 
 class ParseError(Exception):
     """LLM 响应解析错误。"""
@@ -58,13 +68,13 @@ def extract_json_from_text(text: str) -> Dict[str, Any]:
             content = content[start:end]
 
     try:
-        return json.loads(content)
+        return _json_loads(content)
     except json.JSONDecodeError as e:
         logger.debug(f"JSON 解析失败，尝试修复: {e}")
         fixed_content = _try_fix_json(content)
         if fixed_content:
             try:
-                return json.loads(fixed_content)
+                return _json_loads(fixed_content)
             except json.JSONDecodeError:
                 pass
 
@@ -75,14 +85,24 @@ def extract_json_from_text(text: str) -> Dict[str, Any]:
         )
 
 
+def _json_loads(content: str) -> Any:
+    """解析 JSON 文本；安装了 orjson 时优先使用，失败再交给标准库（兼容 NaN 等非严格写法）。"""
+    if _orjson is not None:
+        try:
+            return _orjson.loads(content)
+        except _orjson.JSONDecodeError:
+            pass
+    return json.loads(content)
+
+
 def _try_fix_json(content: str) -> Optional[str]:
     """尝试修复常见的 JSON 格式问题。"""
     if not content:
         return None
 
-    content = re.sub(r',\s*}', '}', content)
-    content = re.sub(r',\s*]', ']', content)
-    content = re.sub(r'"\s*:\s*"', '": "', content)
+    content = _TRAILING_COMMA_OBJ_RE.sub('}', content)
+    content = _TRAILING_COMMA_ARR_RE.sub(']', content)
+    content = _KV_SPACING_RE.sub('": "', content)
     content = content.replace("'", '"')
 
     return content
@@ -30,6 +30,8 @@ class DispatcherConfig(BaseModel):
     summary_max_length: int = 80
     reranker_url: Optional[str] = None
     reranker_timeout_sec: float = 10.0
+    # 问题中明确出现唯一 SOP 名称时跳过 LLM 精排（默认关闭）
+    route_keyword_fast_path: bool = False
 
 
 class LoggingConfig(BaseModel):
@@ -99,6 +101,7 @@ def load_config_from_env() -> AnGIneerConfig:
     dispatcher_config = DispatcherConfig(
         reranker_url=_get_env_str("ANGINEER_RERANKER_URL") or _get_env_str("DOCS_RERANKER_API_URL") or None,
         reranker_timeout_sec=_get_env_float("ANGINEER_RERANKER_TIMEOUT_SEC", 10.0),
+        route_keyword_fast_path=_get_env_bool("ANGINEER_ROUTE_KEYWORD_FAST", False),
     )
 
     return AnGIneerConfig(
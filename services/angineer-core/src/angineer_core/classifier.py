@@ -5,6 +5,7 @@ import json
 import math
 import re
 from collections import Counter
+from functools import lru_cache
 from typing import List, Optional, Tuple, Dict, Any
 
 from angineer_core.base_contracts import SOP, AgentResponse, IntentResult, IntentLevel, ServiceMode, RouteResult
@@ -13,6 +14,7 @@ from ai_inference.llm_response_parser import (
     extract_json_from_text,
 )
 from angineer_core.base_contracts import IntentResponse
+from angineer_core.base_config import get_config
 from angineer_core.base_logger import get_logger
 
 logger = get_logger(__name__)
@@ -46,6 +48,8 @@ STANDARD_CODE_PATTERN = re.compile(
 ROUTE_CONFIDENCE_THRESHOLD = 0.45
 ROUTE_RECALL_TOP_K = 5
 ROUTE_RECALL_MIN_SCORE = 0.02
+# 关键词直达：SOP 名称/ID 至少这么长才参与整词命中，避免短名误触发
+ROUTE_KEYWORD_MIN_NAME_LEN = 4
 
 # 各意图层级的默认升级链：当前路径失败后逐级回退
 DEFAULT_EXECUTION_PLANS: Dict[str, List[str]] = {
@@ -201,16 +205,25 @@ def _trim_generic_tail(value: str) -> str:
     return cleaned
 
 
+@lru_cache(maxsize=128)
+def _infer_ship_type_pair(text: str) -> Optional[Tuple[str, str]]:
+    """按题面匹配船型推断规则，返回 (船型, 设计船型)；同一题面在参数清洗中会被反复查询，故缓存。"""
+    lowered = text.lower()
+    for keywords, ship_type, design_ship_type in SHIP_TYPE_INFERENCE_RULES:
+        if any(keyword.lower() in lowered for keyword in keywords):
+            return ship_type, design_ship_type
+    return None
+
+
 def _infer_ship_types_from_query(query: str) -> Dict[str, str]:
     """根据题面中的船型/货种语义推断可复用的船型字段。"""
-    text = str(query or "")
-    for keywords, ship_type, design_ship_type in SHIP_TYPE_INFERENCE_RULES:
-        if any(keyword.lower() in text.lower() for keyword in keywords):
-            return {
-                "船型": ship_type,
-                "设计船型": design_ship_type,
-            }
-    return {}
+    pair = _infer_ship_type_pair(str(query or ""))
+    if pair is None:
+        return {}
+    return {
+        "船型": pair[0],
+        "设计船型": pair[1],
+    }
 
 
 def _derive_extra_args_from_query(query: str) -> Dict[str, Any]:
@@ -504,6 +517,24 @@ def _build_sop_corpus(sops: List[SOP]) -> Tuple[List[str], List[str]]:
     return doc_ids, documents
 
 
+# 关键词直达：问题中原样出现唯一 SOP 名称时直接命中
+def _keyword_direct_match(query: str, sops: List[SOP]) -> Optional[SOP]:
+    """问题中（忽略空白）恰好包含一个 SOP 的中文名或 ID 时返回该 SOP，否则返回 None。"""
+    compact_query = re.sub(r"\s+", "", query or "").lower()
+    if not compact_query:
+        return None
+    matched: Dict[str, SOP] = {}
+    for sop in sops:
+        for name in (sop.name_zh, sop.id):
+            compact_name = re.sub(r"\s+", "", name or "").lower()
+            if len(compact_name) >= ROUTE_KEYWORD_MIN_NAME_LEN and compact_name in compact_query:
+                matched[sop.id] = sop
+                break
+    if len(matched) != 1:
+        return None
+    return next(iter(matched.values()))
+
+
 # TF-IDF 关键词召回
 def _keyword_recall(
     query: str,
@@ -958,6 +989,30 @@ A: {"intent_level": "L4", "intent_type": "复杂方案设计", "confidence": 0.8
             logger.warning("[DEBUG-SOP-ROUTE] 没有可用的 SOP 列表进行匹配")
             return RouteResult(sop=None, args={}, reason="无可用SOP", confidence=0.0, candidates=[])
 
+        # Step 0: 关键词直达（可选），命中时省去 LLM 精排
+        if get_config().dispatcher.route_keyword_fast_path:
+            direct_sop = _keyword_direct_match(user_query, self.sops)
+            if direct_sop:
+                bb = direct_sop.blackboard or {}
+                required_params = list(bb.get("required") or [])
+                args = _supplement_sop_args_from_query(user_query, required_params, {})
+                reason = f"关键词直达: 问题包含 SOP 名称 {direct_sop.name_zh or direct_sop.id}"
+                logger.info(f"[DEBUG-SOP-ROUTE] ✓ {reason}, args={args}")
+                return RouteResult(
+                    sop=direct_sop,
+                    args=args,
+                    reason=reason,
+                    confidence=1.0,
+                    candidates=[{
+                        "id": direct_sop.id,
+                        "name_zh": direct_sop.name_zh or direct_sop.id,
+                        "description": direct_sop.description_zh or direct_sop.description or "无描述",
+                        "required_params": required_params,
+                        "outputs": bb.get("outputs") or [],
+                        "recall_score": 1.0,
+                    }],
+                )
+
         # Step 1: 关键词粗筛
         logger.info("[DEBUG-SOP-ROUTE] ---------- Stage 1: TF-IDF 关键词召回 ----------")
         doc_ids, documents = _build_sop_corpus(self.sops)
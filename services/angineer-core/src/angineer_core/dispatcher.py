@@ -26,6 +26,26 @@ from angineer_core.base_utils import is_fatal_exception
 logger = get_logger(__name__)
 
 _TOOL_EXEC_TIMEOUT_SECONDS = 120
+# LLM 响应中最多一层嵌套的 JSON 对象
+_NESTED_JSON_OBJECT_RE = re.compile(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', re.DOTALL)
+
+# 工具清单提示词缓存：(ToolRegistry.list_tools() 视图, 渲染后的文本)，注册表变化时视图对象随之更换
+_tools_prompt_cache: Tuple[Any, str] = (None, "")
+
+
+# 引用片段长度：取工具输出 str() 的前 200 字符
+_SNIPPET_LIMIT = 200
+
+
+def _render_tools_prompt(tools_desc: Any) -> str:
+    """把工具清单渲染为提示词片段，同一份注册表视图只渲染一次。"""
+    global _tools_prompt_cache
+    cached_view, cached_text = _tools_prompt_cache
+    if cached_view is tools_desc:
+        return cached_text
+    text = "\n".join(f"- {name}: {desc}" for name, desc in tools_desc.items())
+    _tools_prompt_cache = (tools_desc, text)
+    return text
 
 if TYPE_CHECKING:
     from ai_inference.llm_client import LLMClient
@@ -123,7 +143,7 @@ class Dispatcher:
         _t0 = time.time()
         try:
             if sop_loader is not None:
-                sops = sop_loader.load_all()
+                sops = sop_loader.load_all(lazy_steps=True)
                 classifier = IntentClassifier(sops)
                 intent_result = classifier.classify_intent(
                     query, config_name=self.config_name, mode=self.mode
@@ -1044,7 +1064,7 @@ class Dispatcher:
         try:
             _t_sop = time.time()
             if sop_loader is not None:
-                sops = sop_loader.load_all()
+                sops = sop_loader.load_all(lazy_steps=True)
                 classifier = IntentClassifier(sops)
             else:
                 classifier = None
@@ -1556,7 +1576,6 @@ class Dispatcher:
             return local_rerank(normalized_query, task_type, candidates)
         timeout = cfg.reranker_timeout_sec
         try:
-            import os
             import requests
             docs = [item.text or "" for item in candidates]
             headers = {}
@@ -1913,7 +1932,7 @@ class Dispatcher:
                 citations.append({
                     "source": tool_name,
                     "step_id": step_id,
-                    "snippet": str(outputs)[:200],
+                    "snippet": str(outputs)[:_SNIPPET_LIMIT],
                 })
         return citations
 
@@ -2034,7 +2053,7 @@ class Dispatcher:
         except json.JSONDecodeError:
             pass
         
-        json_match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', cleaned, re.DOTALL)
+        json_match = _NESTED_JSON_OBJECT_RE.search(cleaned)
         if json_match:
             try:
                 return json.loads(json_match.group(0))
@@ -2751,8 +2770,10 @@ class Dispatcher:
                 
             if val is not None:
                 updates[context_key] = val
-                self.memory.update_context({context_key: val})
-        
+
+        # 一次性写回黑板：update_context 每次都会重建上下文快照（含历史 model_dump）
+        if updates:
+            self.memory.update_context(updates)
         return updates
                 
     def _extract_tool_error(self, result: Any) -> Optional[str]:
@@ -2936,8 +2957,7 @@ class Dispatcher:
         if ToolRegistry is None:
             return None, {}
             
-        tools_desc = ToolRegistry.list_tools()
-        tools_str = "\n".join([f"- {name}: {desc}" for name, desc in tools_desc.items()])
+        tools_str = _render_tools_prompt(ToolRegistry.list_tools())
         
         # Prepare context snapshot (truncated to avoid huge prompt)
         context_str = json.dumps(self.memory.get_context_snapshot(), default=str, ensure_ascii=False)
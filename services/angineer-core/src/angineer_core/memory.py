@@ -9,6 +9,8 @@ from angineer_core.base_logger import get_logger
 
 logger = get_logger(__name__)
 
+_VAR_REF_RE = re.compile(r"\$\{(.+?)\}")
+
 
 class UndefinedVariableError(Exception):
     """未定义变量错误。当在严格模式下尝试解析未定义的变量时抛出。"""
@@ -111,6 +113,13 @@ class Memory(BaseModel):
         strict: Optional[bool] = None,
         none_replacement: Optional[str] = None
     ) -> Any:
+        # 标量叶子与不含引用标记的字符串直接返回，无需读取配置或跑正则
+        if isinstance(value, str):
+            if "${" not in value:
+                return value
+        elif not isinstance(value, (dict, list)):
+            return value
+
         config = self.get_config()
         use_strict = strict if strict is not None else config.strict_mode
         replacement = none_replacement if none_replacement is not None else config.none_replacement
@@ -121,11 +130,7 @@ class Memory(BaseModel):
         if isinstance(value, list):
             return [self.resolve_value(v, use_strict, replacement) for v in value]
 
-        if not isinstance(value, str):
-            return value
-
-        pattern = r"\$\{(.+?)\}"
-        matches = re.findall(pattern, value)
+        matches = _VAR_REF_RE.findall(value)
 
         if not matches:
             return value
@@ -195,8 +200,9 @@ class Memory(BaseModel):
             if found:
                 return val
 
-        if key in self.get_context_snapshot():
-            return self.get_context_snapshot()[key]
+        snapshot = self.get_context_snapshot()
+        if key in snapshot:
+            return snapshot[key]
 
         if "." in key:
             step_id, field = key.split(".", 1)
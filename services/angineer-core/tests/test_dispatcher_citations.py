@@ -0,0 +1,38 @@
+"""Dispatcher 引用片段测试。"""
+from types import SimpleNamespace
+
+from angineer_core.dispatcher import Dispatcher
+
+
+def _dispatcher_with_history(*records):
+    return SimpleNamespace(memory=SimpleNamespace(history=list(records)))
+
+
+def test_citation_snippet_is_str_prefix():
+    """片段与 str(outputs)[:200] 完全一致：不排序、不丢键、不加引号、不做中间截断。"""
+    outputs_list = [
+        {"result": 12.5, "table_name": "表 A.0.1", "unit": "m", "source": "规范", "page": 3},
+        {"result": "航道宽度" * 100},
+        "纯文本输出 " * 50,
+        {"z": 1, "a": 2},
+    ]
+    records = [
+        SimpleNamespace(tool_name="table_lookup", step_id=f"s{i}", outputs=outputs)
+        for i, outputs in enumerate(outputs_list)
+    ]
+
+    citations = Dispatcher._build_citations_from_sop_trace(_dispatcher_with_history(*records))
+
+    assert [c["snippet"] for c in citations] == [str(o)[:200] for o in outputs_list]
+
+
+def test_citations_skip_other_tools():
+    """只有检索类工具的输出生成引用。"""
+    records = [
+        SimpleNamespace(tool_name="calculator", step_id="s1", outputs={"result": 1}),
+        SimpleNamespace(tool_name="knowledge_search", step_id="s2", outputs={"result": "条文"}),
+    ]
+
+    citations = Dispatcher._build_citations_from_sop_trace(_dispatcher_with_history(*records))
+
+    assert citations == [{"source": "knowledge_search", "step_id": "s2", "snippet": "{'result': '条文'}"}]
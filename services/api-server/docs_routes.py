@@ -1,4 +1,5 @@
 """知识库路由与解析调度入口"""
+import json
 import logging
 import mimetypes
 import os
@@ -879,8 +880,6 @@ async def get_doc_blocks_graph_view(request: DocBlocksGraphRequest) -> Dict[str,
         meta_path = paths.get_graph_meta_path(request.library_id, request.doc_id)
         meta_build_id = None
         if meta_path.exists():
-            import json
-
             try:
                 meta_build_id = extract_build_id_from_meta(json.loads(meta_path.read_text(encoding="utf-8")))
             except (OSError, json.JSONDecodeError):
@@ -924,8 +923,6 @@ async def get_doc_blocks_graph_summary(request: DocBlocksGraphSummaryRequest) ->
         meta_path = paths.get_graph_meta_path(request.library_id, request.doc_id)
         meta_build_id = None
         if meta_path.exists():
-            import json
-
             try:
                 meta_build_id = extract_build_id_from_meta(json.loads(meta_path.read_text(encoding="utf-8")))
             except (OSError, json.JSONDecodeError):
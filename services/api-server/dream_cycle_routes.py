@@ -7,6 +7,7 @@ import os
 import json
 import sqlite3
 import threading
+import traceback
 from datetime import datetime
 from typing import Optional
 from fastapi import APIRouter, HTTPException, Query
@@ -88,7 +89,6 @@ async def trigger_run():
             runner = DreamCycleRunner()
             runner.run()
         except Exception as e:
-            import traceback
             traceback.print_exc()
 
     thread = threading.Thread(target=_run_in_background, daemon=True)
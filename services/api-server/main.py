@@ -19,8 +19,10 @@ from pydantic import BaseModel, Field
 logger = logging.getLogger(__name__)
 
 # 设置路径
-ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
-SERVICES_DIR = os.path.join(ROOT_DIR, "services")
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+SERVICES_DIR = os.path.dirname(BACKEND_DIR)
+ROOT_DIR = os.path.dirname(SERVICES_DIR)
+TESTS_DIR = os.path.join(SERVICES_DIR, "tests")
 PORT_CONTRACT_PATH = os.path.join(ROOT_DIR, "apps", "shared", "ports.json")
 
 with open(PORT_CONTRACT_PATH, "r", encoding="utf-8") as port_contract_file:
@@ -28,13 +30,16 @@ with open(PORT_CONTRACT_PATH, "r", encoding="utf-8") as port_contract_file:
 
 API_SERVER_PORT = int(PORT_CONTRACT["apiServerPort"])
 
+# 本地包源码目录（sys.path 与热重载监听共用）
+LOCAL_PACKAGE_SRC_DIRS = tuple(
+    os.path.join(SERVICES_DIR, package_name, "src")
+    for package_name in ("angineer-core", "sop-core", "docs-core", "geo-core", "engtools", "evals-core")
+)
+
 # 添加路径sys.path 以支持本地包导入
-sys.path.append(os.path.join(SERVICES_DIR, "angineer-core", "src"))
-sys.path.append(os.path.join(SERVICES_DIR, "sop-core", "src"))
-sys.path.append(os.path.join(SERVICES_DIR, "docs-core", "src"))
-sys.path.append(os.path.join(SERVICES_DIR, "geo-core", "src"))
-sys.path.append(os.path.join(SERVICES_DIR, "engtools", "src"))
-sys.path.append(os.path.join(SERVICES_DIR, "evals-core", "src"))
+for _src_dir in LOCAL_PACKAGE_SRC_DIRS:
+    if _src_dir not in sys.path:
+        sys.path.append(_src_dir)
 
 # Import logic from packages
 from ai_inference.llm_client import LLMClient
@@ -547,7 +552,7 @@ def get_test_content(test_id: str):
         raise HTTPException(status_code=404, detail="Test not found")
     
     test_file = test_files[test_id]
-    test_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "tests", test_file)
+    test_path = os.path.join(TESTS_DIR, test_file)
     
     try:
         with open(test_path, "r", encoding="utf-8") as f:
@@ -559,12 +564,8 @@ def get_test_content(test_id: str):
 def get_test_cases(test_id: str):
     if test_id in ["0", "1", "2", "3", "4"]:
         try:
-            import sys
             import importlib
-            project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-            backend_dir = os.path.abspath(os.path.dirname(__file__))
-            tests_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "tests"))
-            for path_item in [project_root, backend_dir, tests_dir]:
+            for path_item in (SERVICES_DIR, BACKEND_DIR, TESTS_DIR):
                 if path_item not in sys.path:
                     sys.path.append(path_item)
             
@@ -717,7 +718,7 @@ def run_test(test_id: str, config: str = None, query: str = None, mode: str = "i
     if not filename:
         return {"error": "Invalid Test ID"}
         
-    fpath = os.path.join(os.path.dirname(__file__), "..", "tests", filename)
+    fpath = os.path.join(TESTS_DIR, filename)
     
     # Environment variables for test
     env = os.environ.copy()
@@ -799,16 +800,7 @@ if __name__ == "__main__":
         "main:app",
         host="0.0.0.0",
         port=API_SERVER_PORT,
-        app_dir=os.path.dirname(__file__),
+        app_dir=BACKEND_DIR,
         reload=True,
-        reload_dirs=[
-            os.path.dirname(__file__),
-            os.path.join(SERVICES_DIR, "angineer-core", "src"),
-            os.path.join(SERVICES_DIR, "sop-core", "src"),
-            os.path.join(SERVICES_DIR, "docs-core", "src"),
-            os.path.join(SERVICES_DIR, "geo-core", "src"),
-            os.path.join(SERVICES_DIR, "engtools", "src"),
-            os.path.join(SERVICES_DIR, "evals-core", "src"),
-
-        ],
+        reload_dirs=[BACKEND_DIR, *LOCAL_PACKAGE_SRC_DIRS],
     )
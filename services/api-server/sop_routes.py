@@ -4,13 +4,14 @@ import logging
 import os
 import re
 import uuid
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Set
 
 from fastapi import APIRouter, HTTPException, UploadFile, File as FastAPIFile, Form
 from pydantic import BaseModel, Field
 
 from angineer_core.base_contracts import SOP as SopModel, Step as StepModel
-from sop_core.sop_parser import SopParser
+from sop_core.sop_parser import SopParser, atomic_write_json, load_json_bytes
 from sop_core.sop_loader import SopLoader
 
 sop_router = APIRouter()
@@ -23,7 +24,7 @@ SOP_RAW_DIR = os.path.join(SOP_BASE_DIR, "raw")
 SOP_FOLDERS_FILE = os.path.join(SOP_BASE_DIR, "folders.json")
 
 _sop_loader = SopLoader(SOP_BASE_DIR)
-_sop_parser = SopParser()
+_sop_parser = SopParser
 
 
 class SopCreateRequest(BaseModel):
@@ -74,13 +75,18 @@ def _ensure_json_dir() -> None:
     os.makedirs(SOP_JSON_DIR, exist_ok=True)
 
 
+def _load_json_file(path: str) -> Any:
+    """以字节读取并解析 JSON 文件（安装了 orjson 时走 C 实现）。"""
+    with open(path, "rb") as f:
+        return load_json_bytes(f.read())
+
+
 def _read_folders() -> List[Dict[str, Any]]:
     """读取文件夹结构。"""
     if not os.path.exists(SOP_FOLDERS_FILE):
         return []
     try:
-        with open(SOP_FOLDERS_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return _load_json_file(SOP_FOLDERS_FILE)
     except Exception:
         return []
 
@@ -88,8 +94,7 @@ def _read_folders() -> List[Dict[str, Any]]:
 def _write_folders(folders: List[Dict[str, Any]]) -> None:
     """写入文件夹结构。"""
     os.makedirs(os.path.dirname(SOP_FOLDERS_FILE), exist_ok=True)
-    with open(SOP_FOLDERS_FILE, "w", encoding="utf-8") as f:
-        json.dump(folders, f, indent=2, ensure_ascii=False)
+    atomic_write_json(SOP_FOLDERS_FILE, folders)
 
 
 def _sort_items(items: List[Dict[str, Any]], title_key: str) -> List[Dict[str, Any]]:
@@ -125,26 +130,31 @@ def _get_next_folder_sort_order(parent_folder_id: Optional[str]) -> int:
     return (max(sibling_orders) + 1) if sibling_orders else 0
 
 
+@lru_cache(maxsize=512)
+def _summarize_sop_json(path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """解析单个 SOP JSON 并提取列表元数据；以 (路径, mtime, 大小) 为键缓存，文件变更后自动失效。"""
+    data = _load_json_file(path)
+    return {
+        "id": data.get("id", os.path.splitext(os.path.basename(path))[0]),
+        "name_zh": data.get("name_zh", ""),
+        "name_en": data.get("name_en", ""),
+        "description": data.get("description", ""),
+        "folder_id": data.get("folder_id"),
+        "sort_order": data.get("sort_order", 10**9),
+        "step_count": len(data.get("steps", [])),
+    }
+
+
 def _scan_json_sops() -> List[Dict[str, Any]]:
     """扫描 JSON 目录下的 SOP 文件，返回元数据列表。"""
     _ensure_json_dir()
     results = []
-    for fname in os.listdir(SOP_JSON_DIR):
-        if not fname.endswith(".json"):
+    for entry in os.scandir(SOP_JSON_DIR):
+        if not entry.name.endswith(".json"):
             continue
-        fpath = os.path.join(SOP_JSON_DIR, fname)
         try:
-            with open(fpath, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            results.append({
-                "id": data.get("id", os.path.splitext(fname)[0]),
-                "name_zh": data.get("name_zh", ""),
-                "name_en": data.get("name_en", ""),
-                "description": data.get("description", ""),
-                "folder_id": data.get("folder_id"),
-                "sort_order": data.get("sort_order", 10**9),
-                "step_count": len(data.get("steps", [])),
-            })
+            st = entry.stat()
+            results.append(dict(_summarize_sop_json(entry.path, st.st_mtime_ns, st.st_size)))
         except Exception:
             continue
     return _sort_items(results, "name_zh")
@@ -155,8 +165,7 @@ def _read_sop_json(sop_id: str) -> Optional[Dict[str, Any]]:
     json_path = os.path.join(SOP_JSON_DIR, f"{sop_id}.json")
     if not os.path.exists(json_path):
         return None
-    with open(json_path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return _load_json_file(json_path)
 
 
 def _write_sop_json(sop_id: str, data: Dict[str, Any]) -> None:
@@ -164,8 +173,7 @@ def _write_sop_json(sop_id: str, data: Dict[str, Any]) -> None:
     _ensure_json_dir()
     json_path = os.path.join(SOP_JSON_DIR, f"{sop_id}.json")
     data["id"] = sop_id
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    atomic_write_json(json_path, data)
 
 
 def _normalize_inline_step_description(value: Any, allow_string: bool) -> Dict[str, Any]:
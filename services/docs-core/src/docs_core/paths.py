@@ -16,6 +16,7 @@
 """
 
 import os
+from functools import lru_cache
 from pathlib import Path
 
 KNOWLEDGE_META_DB_NAME = "knowledge_meta.sqlite"
@@ -33,8 +34,9 @@ def _knowledge_base(base_dir: Path | str | None) -> Path:
 # ---- 仓库与数据根 ----
 
 
+@lru_cache(maxsize=1)
 def resolve_repo_root() -> Path:
-    """解析 monorepo 根目录（向上找 apps/services/package.json 并存）。"""
+    """解析 monorepo 根目录（向上找 apps/services/package.json 并存）；结果进程内不变，缓存。"""
     current_file = Path(__file__).resolve()
     for candidate in current_file.parents:
         if (
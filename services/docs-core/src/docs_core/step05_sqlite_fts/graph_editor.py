@@ -802,9 +802,10 @@ def _invalidate_edited_formula_semantics(
         if "formula_semantics" not in node:
             continue
         before = before_by_uid.get(uid)
+        before_node = before or {}
         before_math = str(
-            (before or {}).get("math_content_corrected")
-            or (before or {}).get("math_content")
+            before_node.get("math_content_corrected")
+            or before_node.get("math_content")
             or ""
         )
         now_math = str(
@@ -813,8 +814,8 @@ def _invalidate_edited_formula_semantics(
             or ""
         )
         before_plain = str(
-            (before or {}).get("plain_text_corrected")
-            or (before or {}).get("plain_text")
+            before_node.get("plain_text_corrected")
+            or before_node.get("plain_text")
             or ""
         )
         now_plain = str(
@@ -822,7 +823,7 @@ def _invalidate_edited_formula_semantics(
             or node.get("plain_text")
             or ""
         )
-        before_explain = set(_collect_block_ref_uids((before or {}).get("explanation_uids")))
+        before_explain = set(_collect_block_ref_uids(before_node.get("explanation_uids")))
         now_explain = set(_collect_block_ref_uids(node.get("explanation_uids")))
         if (
             before is None
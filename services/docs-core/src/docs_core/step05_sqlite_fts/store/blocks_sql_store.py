@@ -1114,7 +1114,6 @@ class KnowledgeIndexStore:
             parsed_json = {}
             if isinstance(content_json, str) and content_json.strip():
                 try:
-                    import json
                     parsed_json = json.loads(content_json)
                 except Exception:
                     pass
@@ -4,7 +4,7 @@ import json
 import logging
 from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
-from ai_inference.llm_client import LLMClient
+from ai_inference.llm_client import get_llm_client
 
 from docs_core.step07_graph.config import (
     EntityLayer,
@@ -128,7 +128,7 @@ Text:
 Extract all entities and relationships related to seed entities: "{seeds_str}"."""
 
         try:
-            client = LLMClient()
+            client = get_llm_client()
             response = client.chat(
                 messages=[
                     {"role": "system", "content": EXTRACT_SYSTEM_PROMPT},
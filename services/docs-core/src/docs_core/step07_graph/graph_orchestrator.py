@@ -18,7 +18,7 @@ from docs_core.step07_graph.extractor_prompts import (
 )
 from docs_core.step07_graph.relation_infer import RelationInferrer
 from docs_core.step07_graph.evidence_builder import EvidencePacket
-from ai_inference.llm_client import LLMClient
+from ai_inference.llm_client import get_llm_client
 
 logger = logging.getLogger(__name__)
 
@@ -226,11 +226,15 @@ class GraphOrchestrator:
         if not occurrences:
             return {"packet_id": packet.packet_id, "entities_found": 0, "relations_added": 0}
 
+        seed_by_name: Dict[str, Any] = {}
+        for s in seed_entities:
+            seed_by_name.setdefault(s.name, s)
+
         entity_count = 0
         relation_count = 0
 
         for seed_name, _ in occurrences:
-            seed = next((s for s in seed_entities if s.name == seed_name), None)
+            seed = seed_by_name.get(seed_name)
             if seed is None:
                 continue
 
@@ -484,7 +488,7 @@ class GraphOrchestrator:
             "\n\nSource text:\n" + packet_text[:VERIFY_MAX_TEXT]
         )
         try:
-            client = LLMClient()
+            client = get_llm_client()
             response = client.chat(
                 messages=[
                     {"role": "system", "content": VERIFY_SYSTEM_PROMPT},
@@ -511,7 +515,7 @@ class GraphOrchestrator:
             "Do NOT force connections. Do NOT output entities that merely co-occur in the same section."
         )
         try:
-            client = LLMClient()
+            client = get_llm_client()
             response = client.chat(
                 messages=[
                     {"role": "system", "content": ZETTELKASTEN_SYSTEM_PROMPT},
@@ -597,7 +601,7 @@ class GraphOrchestrator:
             for key, system_prompt in extractor_configs:
                 prompt = USER_PROMPT_TEMPLATE_NO_SECTION.format(entity_names=entity_names_str, text_segment=chunk)
                 try:
-                    client = LLMClient()
+                    client = get_llm_client()
                     response = client.chat(
                         messages=[
                             {"role": "system", "content": system_prompt},
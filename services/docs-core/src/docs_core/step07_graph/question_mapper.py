@@ -5,7 +5,7 @@ import logging
 from dataclasses import dataclass, field
 from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
-from ai_inference.llm_client import LLMClient
+from ai_inference.llm_client import get_llm_client
 
 from docs_core.step07_graph.config import DEFAULT_LLM_CONFIG
 
@@ -111,7 +111,7 @@ Available Graph Entities:
 Map this question to the graph. Does a path exist? Is it consistent?"""
 
         try:
-            client = LLMClient()
+            client = get_llm_client()
             response = client.chat(
                 messages=[
                     {"role": "system", "content": QUESTION_MAP_SYSTEM_PROMPT},
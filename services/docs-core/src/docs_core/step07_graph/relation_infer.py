@@ -4,7 +4,7 @@ import json
 import logging
 from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
-from ai_inference.llm_client import LLMClient
+from ai_inference.llm_client import get_llm_client
 
 from docs_core.step07_graph.config import RelationType, DEFAULT_LLM_CONFIG
 
@@ -62,7 +62,7 @@ Text:
 Analyze pairwise relationships between these entities based on the text. Only include relationships with clear evidence."""
 
         try:
-            client = LLMClient()
+            client = get_llm_client()
             response = client.chat(
                 messages=[
                     {"role": "system", "content": RELATION_SYSTEM_PROMPT},
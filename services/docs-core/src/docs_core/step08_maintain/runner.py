@@ -7,6 +7,7 @@
 import json
 import logging
 import os
+import re
 import sqlite3
 import time
 import traceback
@@ -378,7 +379,6 @@ class DreamCycleRunner:
             for row in rows:
                 doc = str(row[2] or "")
                 # 尝试提取文档标题/ID 中的四位年份
-                import re
                 year_match = re.search(r'(?:19|20)\d{2}', doc)
                 if year_match:
                     doc_years.setdefault(doc, int(year_match.group()))
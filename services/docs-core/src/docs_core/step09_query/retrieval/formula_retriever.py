@@ -1,4 +1,5 @@
 """公式/计算问答专用检索器。"""
+import re
 from typing import List, Optional, Sequence
 
 from docs_core.models.types import CanonicalBlock, CanonicalDocument
@@ -7,6 +8,10 @@ from docs_core.step09_query.protocols.data_port import QueryDataPort, default_qu
 from docs_core.step09_query.retrieval.dense_retriever import score_text
 from docs_core.step09_query.retrieval.query_normalizer import contains_clause_ref, extract_clause_refs, extract_formula_identifiers, tokenize_query
 
+# 计算说明类标记词：逐块/逐 chunk 判断，合并为一次正则扫描
+_CALC_MARKER_RE = re.compile("按式|式中|统计|取值|频率|计算|确定")
+_CONTEXT_CALC_MARKER_RE = re.compile("按式|式中|统计|频率|计算|确定")
+
 
 # 判断问题是否在询问公式、按式计算或计算步骤。
 def is_formula_query(query: str, task_type: str = "content_qa") -> bool:
@@ -95,7 +100,7 @@ def build_formula_context_text(
             continue
         if block.block_type != "formula":
             has_clause_ref = bool(clause_refs) and any(contains_clause_ref(text, ref) for ref in clause_refs)
-            has_calc_marker = any(marker in text for marker in ("按式", "式中", "统计", "取值", "频率", "计算", "确定"))
+            has_calc_marker = _CALC_MARKER_RE.search(text) is not None
             has_query_overlap = score_text(query_tokens, block.section_path, text) > 0
             if not (has_clause_ref or has_calc_marker or has_query_overlap):
                 continue
@@ -172,7 +177,7 @@ def build_formula_candidates(
             context_score += 10.0
         if calc_query:
             context_score += 6.0
-        if any(marker in context_text for marker in ("按式", "式中", "统计", "频率", "计算", "确定")):
+        if _CONTEXT_CALC_MARKER_RE.search(context_text):
             context_score += 4.0
         if formula_identifier_hits:
             context_score += 4.0 * formula_identifier_hits
@@ -210,7 +215,7 @@ def build_formula_chunk_candidates(
             continue
         score = score_text(query_tokens, chunk.section_path, chunk_text)
         exact_ref = bool(clause_refs) and any(contains_clause_ref(f"{chunk.section_path}\n{chunk_text}", ref) for ref in clause_refs)
-        has_calc_marker = any(marker in chunk_text for marker in ("按式", "式中", "统计", "频率", "取值", "计算", "确定"))
+        has_calc_marker = _CALC_MARKER_RE.search(chunk_text) is not None
         if exact_ref:
             score += 8.0
         if calc_query and has_calc_marker:
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Type
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, Type
 from pydantic import BaseModel
     
 class BaseTool(ABC):
@@ -32,6 +33,8 @@ class ToolRegistry:
     工具注册表，负责管理和查找所有已注册的工具。
     """
     _registry: Dict[str, BaseTool] = {}
+    # list_tools 结果缓存，注册新工具时失效
+    _tools_view: Optional[Mapping[str, Dict[str, str]]] = None
     
     @classmethod
     def register(cls, tool: BaseTool):
@@ -39,6 +42,7 @@ class ToolRegistry:
         将工具实例注册到注册表中。
         """
         cls._registry[tool.name] = tool
+        cls._tools_view = None
         
     @classmethod
     def get_tool(cls, name: str) -> BaseTool:
@@ -67,16 +71,21 @@ class ToolRegistry:
         return None
         
     @classmethod
-    def list_tools(cls) -> Dict[str, Dict[str, str]]:
+    def list_tools(cls) -> Mapping[str, Dict[str, str]]:
         """
         列出所有工具及其双语描述。
+        结果在两次注册之间缓存复用，返回只读视图，调用方不要修改。
         """
-        return {
-            name: {
-                "en": tool.description_en,
-                "zh": tool.description_zh
-            } for name, tool in cls._registry.items()
-        }
+        tools_view = cls._tools_view
+        if tools_view is None:
+            tools_view = MappingProxyType({
+                name: {
+                    "en": tool.description_en,
+                    "zh": tool.description_zh
+                } for name, tool in cls._registry.items()
+            })
+            cls._tools_view = tools_view
+        return tools_view
 
 
 # 用于简化工具注册的装饰器
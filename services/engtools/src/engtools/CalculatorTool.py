@@ -7,6 +7,26 @@ try:
 except Exception:
     sp = None
 
+# 上标、中文括号与中英文运算符的单字符归一化表，一次 translate 完成
+_EXPR_CHAR_TABLE = str.maketrans({
+    "²": "**2",
+    "³": "**3",
+    "（": "(",
+    "）": ")",
+    "＋": "+",
+    "－": "-",
+    "×": "*",
+    "÷": "/",
+    "＝": "=",
+    "—": "-",  # 中文破折号
+    "–": "-",  # 英文 en-dash
+    "−": "-",  # Unicode 减号
+})
+_VAR_REF_RE = re.compile(r"\$\{([^}]+)\}")
+_TRAILING_UNIT_RE = re.compile(r'(?<=[\d.])\s*[a-zA-Zα-ωΑ-Ω_]+(?![a-zA-Zα-ωΑ-Ω_0-9])')
+_THOUSANDS_SEP_RE = re.compile(r'(?<=\d),(?=\d)')
+_WHITESPACE_RE = re.compile(r'\s+')
+
 
 @register_tool
 class Calculator(BaseTool):
@@ -178,21 +198,10 @@ class Calculator(BaseTool):
         expr = expression.strip()
 
         # 变量替换：${var} → var（保留变量名供后续替换）
-        expr = re.sub(r"\$\{([^}]+)\}", r"\1", expr)
-
-        # 处理工程表示法中的上标（如 m² → m2, m³ → m3）
-        expr = expr.replace("²", "**2").replace("³", "**3")
-
-        # 处理中文括号
-        expr = expr.replace("（", "(").replace("）", ")")
+        expr = _VAR_REF_RE.sub(r"\1", expr)
 
-        # 处理中文运算符
-        expr = expr.replace("＋", "+").replace("－", "-")
-        expr = expr.replace("×", "*").replace("÷", "/")
-        expr = expr.replace("＝", "=")
-        expr = expr.replace("—", "-")  # 中文破折号
-        expr = expr.replace("–", "-")  # 英文 en-dash
-        expr = expr.replace("−", "-")  # Unicode 减号
+        # 处理工程表示法中的上标（如 m² → m**2）、中文括号与中文运算符
+        expr = expr.translate(_EXPR_CHAR_TABLE)
 
         # 处理数学函数的中文别名
         expr = expr.replace("平方根", "sqrt").replace("开方", "sqrt")
@@ -200,17 +209,17 @@ class Calculator(BaseTool):
 
         # 清理工程单位（如 12.3m → 12.3，保留数值）
         # 注意：只清理附着在数字后的单位，独立变量名保留
-        expr = re.sub(r'(?<=[\d.])\s*[a-zA-Zα-ωΑ-Ω_]+(?![a-zA-Zα-ωΑ-Ω_0-9])', '', expr)
+        expr = _TRAILING_UNIT_RE.sub('', expr)
 
         # 清理度数符号（如 30° → 30）
         expr = expr.replace("°", "")
         expr = expr.replace("%%", "%")
 
         # 清理千分位逗号（如 1,000 → 1000）
-        expr = re.sub(r'(?<=\d),(?=\d)', '', expr)
+        expr = _THOUSANDS_SEP_RE.sub('', expr)
 
         # 去除多余空格
-        expr = re.sub(r'\s+', ' ', expr)
+        expr = _WHITESPACE_RE.sub(' ', expr)
 
         return expr
 
@@ -90,7 +90,6 @@ class KnowledgeSearchTool(BaseTool):
 
         def tokenize(text: str):
             """分词，兼容中英文与符号。"""
-            import re
             tokens = re.findall(r"[\u4e00-\u9fff]|[A-Za-z]+|\d+", text.lower())
             return tokens
 
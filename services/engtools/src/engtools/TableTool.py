@@ -1,20 +1,35 @@
 import os
 import re
 import json
+import hashlib
 import sys
 import logging
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 from difflib import SequenceMatcher
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from .BaseTool import BaseTool, register_tool
-from .config import KNOWLEDGE_DIR
+from .config import KNOWLEDGE_DIR, TABLE_HTML_PARSER
 from ai_inference.llm_client import get_llm_client
 
 logger = logging.getLogger(__name__)
 
 _LLM_TIMEOUT_SECONDS = 60
 
+# LLM 模式只需要 <table> 子树：默认内置 html.parser，显式配置 lxml 且已安装时才用 C 解析器
+_TABLE_HTML_PARSER = "html.parser"
+if TABLE_HTML_PARSER == "lxml":
+    try:
+        import lxml  # noqa: F401
+        _TABLE_HTML_PARSER = "lxml"
+    except ImportError:
+        logger.warning("ENGTOOLS_TABLE_HTML_PARSER=lxml 但未安装 lxml，回退为 html.parser")
+
+# LLM 模式表格候选缓存：文档内容摘要 -> all_tables，避免每次查询重复解析整篇知识库
+_LLM_TABLES_CACHE: Dict[bytes, List[Dict[str, Any]]] = {}
+_LLM_TABLES_CACHE_MAX = 16
+
 
 # ============================================================================
 # 第一部分：通用工具函数
@@ -223,8 +238,8 @@ def _parse_table_headers(table) -> List[str]:
         if ths:
             return [th.get_text(strip=True) for th in ths]
     
-    # 获取前两行，处理合并单元格
-    rows = table.find_all("tr")
+    # 获取前两行，处理合并单元格（只取前两行，不遍历整张表）
+    rows = table.find_all("tr", limit=2)
     if not rows:
         return []
     if _infer_header_row_count(rows) == 1:
@@ -429,7 +444,10 @@ def _llm_find_table(all_tables: List[Dict], table_hint: str) -> Optional[Dict]:
     """根据表格提示找到匹配的表格。"""
     hint_normalized = _llm_normalize_for_matching(table_hint)
     for table in all_tables:
-        caption_normalized = _llm_normalize_for_matching(table.get('caption', ''))
+        # 标题归一化结果在建表时预先计算
+        caption_normalized = table.get('norm_caption')
+        if caption_normalized is None:
+            caption_normalized = _llm_normalize_for_matching(table.get('caption', ''))
         if hint_normalized in caption_normalized or caption_normalized in hint_normalized:
             return table
     return None
@@ -599,27 +617,51 @@ def _inject_fallback_meta(result: Dict[str, Any], target_table: Dict, fallback_u
     return result
 
 
-def _llm_query_table(html_content: str, table_hint: str, query: str, query_conditions: Any = None, model: str = None) -> Dict[str, Any]:
-    """
-    两阶段表格查询：
-    阶段1：使用 LLM 语义定位最相关的表格
-    阶段2：使用结构化解析在定位的表格内查找行和列
+def _build_llm_tables(html_content: str) -> List[Dict[str, Any]]:
+    """解析文档中的全部 HTML 表格，构建 LLM 模式的候选表格列表。
+
+    标题由正则从原文提取，表格解析用 SoupStrainer 只构建 <table> 子树。
     """
-    soup = BeautifulSoup(html_content, 'html.parser')
+    soup = BeautifulSoup(html_content, _TABLE_HTML_PARSER, parse_only=SoupStrainer('table'))
     html_tables = soup.find_all('table')
     table_titles = re.findall(r'([^<\n]+?)\s*<table', html_content)
     
-    # 构建所有候选表格
     all_tables = []
     for i, table in enumerate(html_tables):
         caption = table_titles[i] if i < len(table_titles) else f"表格 {i+1}"
         all_tables.append({
             "index": i + 1,
             "caption": caption,
+            "norm_caption": _llm_normalize_for_matching(caption),
             "html": str(table),
             "table": table,
             "type": "html"
         })
+    return all_tables
+
+
+def _get_llm_tables(html_content: str) -> List[Dict[str, Any]]:
+    """按内容摘要缓存 _build_llm_tables 结果；同一文档多次查表只解析一次。
+
+    返回的列表与表格对象在多次查询间共享，调用方只读不改。
+    """
+    digest = hashlib.blake2b((html_content or "").encode("utf-8"), digest_size=16).digest()
+    all_tables = _LLM_TABLES_CACHE.get(digest)
+    if all_tables is None:
+        all_tables = _build_llm_tables(html_content)
+        if len(_LLM_TABLES_CACHE) >= _LLM_TABLES_CACHE_MAX:
+            _LLM_TABLES_CACHE.clear()
+        _LLM_TABLES_CACHE[digest] = all_tables
+    return all_tables
+
+
+def _llm_query_table(html_content: str, table_hint: str, query: str, query_conditions: Any = None, model: str = None) -> Dict[str, Any]:
+    """
+    两阶段表格查询：
+    阶段1：使用 LLM 语义定位最相关的表格
+    阶段2：使用结构化解析在定位的表格内查找行和列
+    """
+    all_tables = _get_llm_tables(html_content)
     
     # ========== 阶段1：LLM 定位表格 ==========
     target_table = _llm_find_table(all_tables, table_hint)
@@ -898,7 +940,78 @@ def _llm_extract_from_table_html(target_table: Dict, query: str, fallback_used:
 
 
 # ============================================================================
-# 第七部分：TableLookupTool 工具类
+# 第七部分：知识库文件缓存（按路径 + mtime + size 记忆化）
+# ============================================================================
+
+def _file_signature(path: str) -> Tuple[int, int]:
+    """返回文件的 (mtime_ns, size)，作为缓存键的一部分，文件变化即失效。"""
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+@lru_cache(maxsize=8)
+def _read_knowledge_text(path: str, mtime_ns: int, size: int) -> str:
+    """读取知识库 Markdown 全文。"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+@lru_cache(maxsize=8)
+def _load_structured_candidates(path: str, mtime_ns: int, size: int) -> Tuple[Dict[str, Any], ...]:
+    """解析知识库文件中的 HTML 与 Markdown 表格，构建结构化模式的候选表（只读共享）。
+
+    HTML 表格在此一次性提取为纯字符串表头与行，缓存中不保留 BeautifulSoup 对象，
+    避免每个缓存条目挂住整棵文档树。
+    """
+    content = _read_knowledge_text(path, mtime_ns, size)
+    soup = BeautifulSoup(content, 'html.parser')
+    html_tables = soup.find_all('table')
+    candidates = []
+    for idx, tbl in enumerate(html_tables):
+        table_html = str(tbl)
+        context_text = _get_table_context(tbl)
+        if context_text:
+            lines = [ln.strip() for ln in context_text.splitlines() if ln.strip()]
+            if lines:
+                preferred = next((ln for ln in reversed(lines) if "图" in ln or "表" in ln or "Table" in ln), None)
+                context_text = preferred or lines[-1]
+            if context_text:
+                match = re.search(r"((?:图|Figure)\s*[A-Za-z0-9]+(?:\.[A-Za-z0-9]+)*(?:-\d+)?[^\n]*)", context_text, re.IGNORECASE)
+                if not match:
+                    match = re.search(r"((?:表|Table)\s*[A-Za-z0-9]+(?:\.[A-Za-z0-9]+)*(?:-\d+)?[^\n]*)", context_text, re.IGNORECASE)
+                if match:
+                    context_text = match.group(1).strip()
+                    context_text = re.split(r"\s*/\s*", context_text, maxsplit=1)[0].strip()
+                    concise_match = re.search(r"((?:图|表)\s*[A-Za-z0-9.]+(?:-\d+)?[^/\n]{0,24})", context_text)
+                    if concise_match:
+                        context_text = concise_match.group(1).strip()
+                    context_text = re.sub(r"[)\]）】〉》>]+$", "", context_text).strip()
+        # 不再截断上下文，保留完整表名用于匹配
+        candidates.append({
+            "html": table_html,
+            "context": context_text,
+            "index": idx,
+            "headers": tuple(_parse_table_headers(tbl)),
+            "rows": tuple(tuple(r) for r in _parse_table_rows(tbl)),
+            "type": "html"
+        })
+    soup.decompose()
+    markdown_tables = _extract_markdown_tables(content)
+    for idx, tbl in enumerate(markdown_tables, start=len(candidates)):
+        candidates.append({
+            "html": "",
+            "context": tbl.get("context", ""),
+            "index": idx,
+            "headers": tbl.get("headers", []),
+            "rows": tbl.get("rows", []),
+            "type": "markdown"
+        })
+
+    return tuple(candidates)
+
+
+# ============================================================================
+# 第八部分：TableLookupTool 工具类
 # ============================================================================
 
 @register_tool
@@ -1012,8 +1125,10 @@ class TableLookupTool(BaseTool):
             knowledge_file = self._resolve_file(file_name)
             if not knowledge_file:
                 return {"error": f"未找到知识库文件: {file_name}"}
-            with open(knowledge_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+            try:
+                content = _read_knowledge_text(knowledge_file, *_file_signature(knowledge_file))
+            except Exception as e:
+                return {"error": f"无法读取文件: {str(e)}"}
             
             # 将 query_conditions 转换为自然语言查询
             if isinstance(query_conditions, dict):
@@ -1044,52 +1159,12 @@ class TableLookupTool(BaseTool):
             return {"error": f"未找到知识库文件: {file_name}"}
         
         try:
-            with open(knowledge_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except Exception as e:
+            # 候选表按文件缓存（列表会被原地排序，先浅拷贝）
+            candidates = list(_load_structured_candidates(knowledge_file, *_file_signature(knowledge_file)))
+        except (OSError, UnicodeDecodeError) as e:
             return {"error": f"无法读取文件: {str(e)}"}
 
         trace.append(f"加载知识库文件: {file_name}")
-        soup = BeautifulSoup(content, 'html.parser')
-        html_tables = soup.find_all('table')
-        candidates = []
-        for idx, tbl in enumerate(html_tables):
-            table_html = str(tbl)
-            context_text = _get_table_context(tbl)
-            if context_text:
-                lines = [ln.strip() for ln in context_text.splitlines() if ln.strip()]
-                if lines:
-                    preferred = next((ln for ln in reversed(lines) if "图" in ln or "表" in ln or "Table" in ln), None)
-                    context_text = preferred or lines[-1]
-                if context_text:
-                    match = re.search(r"((?:图|Figure)\s*[A-Za-z0-9]+(?:\.[A-Za-z0-9]+)*(?:-\d+)?[^\n]*)", context_text, re.IGNORECASE)
-                    if not match:
-                        match = re.search(r"((?:表|Table)\s*[A-Za-z0-9]+(?:\.[A-Za-z0-9]+)*(?:-\d+)?[^\n]*)", context_text, re.IGNORECASE)
-                    if match:
-                        context_text = match.group(1).strip()
-                        context_text = re.split(r"\s*/\s*", context_text, maxsplit=1)[0].strip()
-                        concise_match = re.search(r"((?:图|表)\s*[A-Za-z0-9.]+(?:-\d+)?[^/\n]{0,24})", context_text)
-                        if concise_match:
-                            context_text = concise_match.group(1).strip()
-                        context_text = re.sub(r"[)\]）】〉》>]+$", "", context_text).strip()
-            # 不再截断上下文，保留完整表名用于匹配
-            candidates.append({
-                "html": table_html,
-                "context": context_text,
-                "index": idx,
-                "table": tbl,
-                "type": "html"
-            })
-        markdown_tables = _extract_markdown_tables(content)
-        for idx, tbl in enumerate(markdown_tables, start=len(candidates)):
-            candidates.append({
-                "html": "",
-                "context": tbl.get("context", ""),
-                "index": idx,
-                "headers": tbl.get("headers", []),
-                "rows": tbl.get("rows", []),
-                "type": "markdown"
-            })
 
         conditions = _parse_query_conditions(query_conditions)
         
@@ -1191,12 +1266,9 @@ class TableLookupTool(BaseTool):
                 },
             }
 
-        if target_table.get("headers") is not None:
-            headers = target_table.get("headers") or []
-            rows = target_table.get("rows") or []
-        else:
-            headers = _parse_table_headers(target_table["table"])
-            rows = _parse_table_rows(target_table["table"])
+        # 缓存共享的候选表，复制一份避免下游修改污染缓存
+        headers = list(target_table.get("headers") or [])
+        rows = [list(r) for r in (target_table.get("rows") or [])]
         trace.append(f"匹配表名: {table_name}")
         trace.append(f"匹配表格上下文: {target_table['context']}")
         trace.append(f"解析表头: {headers}")
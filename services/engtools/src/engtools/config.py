@@ -19,3 +19,14 @@ def get_knowledge_dir() -> str:
     return knowledge_dir
 
 KNOWLEDGE_DIR = get_knowledge_dir()
+
+
+def get_table_html_parser() -> str:
+    """LLM 模式表格的 HTML 解析器名。
+
+    默认为内置 html.parser；设置 ENGTOOLS_TABLE_HTML_PARSER=lxml 才改用 lxml（需安装 fast 扩展）。
+    两者对残缺或嵌套表格构造的树不同，因此不随 lxml 是否可导入而自动切换。
+    """
+    return (os.getenv("ENGTOOLS_TABLE_HTML_PARSER") or "html.parser").strip() or "html.parser"
+
+TABLE_HTML_PARSER = get_table_html_parser()
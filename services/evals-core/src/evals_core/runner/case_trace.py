@@ -284,7 +284,8 @@ def run_eval_case_trace(
             for file_name in os.listdir(sop_json_dir)
             if file_name.endswith(".json")
         )
-    unloaded_sop_ids = [sop_id for sop_id in all_sop_json_ids if sop_id not in loaded_sop_ids]
+    loaded_sop_id_set = frozenset(loaded_sop_ids)
+    unloaded_sop_ids = [sop_id for sop_id in all_sop_json_ids if sop_id not in loaded_sop_id_set]
 
     classifier = IntentClassifier(sops)
     intent_result = classifier.classify_intent(
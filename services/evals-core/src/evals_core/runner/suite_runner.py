@@ -2,6 +2,8 @@
 import os
 import threading
 import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from typing import Any, Callable, Dict, List, Optional
 
@@ -15,6 +17,14 @@ from evals_core.storage import result_store
 
 PASSED_THRESHOLD = 0.8
 
+
+def _read_eval_workers() -> int:
+    """读取单次评测的题目并发数（ANGINEER_EVAL_WORKERS，默认 1 即串行），每次运行时读取。"""
+    try:
+        return max(1, int(os.environ.get("ANGINEER_EVAL_WORKERS", "1")))
+    except ValueError:
+        return 1
+
 # 全局并发控制锁：确保同一时间只有一个评测任务在运行
 _eval_lock = threading.RLock()
 _current_run_id: Optional[str] = None
@@ -281,6 +291,17 @@ def _enrich_detail_with_question(detail: Dict[str, Any], question: Dict[str, Any
     }
 
 
+def _enrich_details(details: List[Dict[str, Any]], questions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """按 question_id 索引题目后批量补全运行详情（同 id 取首个），避免逐条线性查找。"""
+    questions_by_id: Dict[str, Dict[str, Any]] = {}
+    for question in questions:
+        questions_by_id.setdefault(str(question.get("question_id") or ""), question)
+    return [
+        _enrich_detail_with_question(detail, questions_by_id.get(detail["question_id"], {}))
+        for detail in details
+    ]
+
+
 def _run_suite_thread(
     run_id: str, dataset_id: str, questions: List[Dict[str, Any]],
     override_doc_ids: Optional[List[str]] = None,
@@ -295,25 +316,23 @@ def _run_suite_thread(
         return
     
     _current_run_id = run_id
-    _stop_event = threading.Event()
+    _stop_event = stop_event = threading.Event()
     
     try:
-        evaluators = _build_evaluators()
-        total = len(questions)
-        for idx, question in enumerate(questions):
-            # 检查是否收到停止信号（在每道题目开始前检查）
-            if _stop_event.is_set():
-                # 优雅退出：计算已完成的汇总指标并标记为已取消
-                details = result_store.list_run_details(run_id)
-                enriched_details = []
-                for d in details:
-                    q = next((q for q in questions if str(q.get("question_id") or "") == d["question_id"]), {})
-                    enriched = _enrich_detail_with_question(d, q)
-                    enriched_details.append(enriched)
-                summary = _compute_summary(enriched_details)
-                result_store.cancel_run(run_id, summary)
-                return
-            
+        # 评测器实例可能持有客户端等状态，每个工作线程各自构建一份，不跨线程共享
+        worker_state = threading.local()
+
+        def _thread_evaluators() -> Dict[str, Any]:
+            """返回当前工作线程专属的评测器映射。"""
+            evaluators = getattr(worker_state, "evaluators", None)
+            if evaluators is None:
+                evaluators = worker_state.evaluators = _build_evaluators()
+            return evaluators
+
+        def _run_question(question: Dict[str, Any]) -> bool:
+            """评测单题并写回结果；收到停止信号后不再开始新题目。"""
+            if stop_event.is_set():
+                return False
             question_id = str(question.get("question_id") or "")
             evaluator_names = _determine_evaluator_names(question)
             if override_doc_ids is not None:
@@ -330,7 +349,7 @@ def _run_suite_thread(
                     "prediction": partial_prediction,
                 })
 
-            result = _run_single_question(question, evaluator_names, evaluators, stage_callback=_stage_callback)
+            result = _run_single_question(question, evaluator_names, _thread_evaluators(), stage_callback=_stage_callback)
             result_store.update_run_detail(run_id, question_id, {
                 "status": result.get("status", "error"),
                 "quality": result.get("quality"),
@@ -341,20 +360,35 @@ def _run_suite_thread(
                 "error": result.get("error"),
                 "latency_ms": result.get("latency_ms"),
             })
-            completed = idx + 1
-            result_store.update_run_progress(run_id, completed)
+            return True
+
+        completed = 0
+        # 题目级并发：每题独立构建 Dispatcher，结果库按线程持有连接，耗时主要在 LLM/检索 I/O
+        workers = min(_read_eval_workers(), max(1, len(questions)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="eval-case") as pool:
+            futures = [pool.submit(_run_question, question) for question in questions]
+            try:
+                for future in as_completed(futures):
+                    if future.result():
+                        completed += 1
+                        result_store.update_run_progress(run_id, completed)
+            except BaseException:
+                # 任一题目异常即放弃未开始的题目，与串行执行时的失败语义一致
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+
+        if stop_event.is_set() and completed < len(questions):
+            # 优雅退出：计算已完成的汇总指标并标记为已取消
+            details = result_store.list_run_details(run_id)
+            summary = _compute_summary(_enrich_details(details, questions))
+            result_store.cancel_run(run_id, summary)
+            return
         details = result_store.list_run_details(run_id)
-        enriched_details = []
-        for d in details:
-            q = next((q for q in questions if str(q.get("question_id") or "") == d["question_id"]), {})
-            enriched = _enrich_detail_with_question(d, q)
-            enriched_details.append(enriched)
-        summary = _compute_summary(enriched_details)
+        summary = _compute_summary(_enrich_details(details, questions))
         result_store.complete_run(run_id, summary)
     except Exception as exc:
         if is_fatal_exception(exc):
             raise
-        import traceback
         traceback.print_exc()
         result_store.fail_run(run_id, str(exc))
     finally:
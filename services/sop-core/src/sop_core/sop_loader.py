@@ -1,19 +1,19 @@
 import os
 import glob
+import re
+import io
 import json
 import sys
-from typing import List, Dict, Any, Optional
-
-# Ensure src can be imported
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
 
 from angineer_core.base_contracts import SOP, Step
-from sop_core.sop_parser import SopParser
+from sop_core.sop_parser import SopParser, atomic_write_json, load_json_bytes
 
-try:
-    from engtools import ToolRegistry as _ToolRegistry
-except Exception:
-    _ToolRegistry = None
+# engtools 注册表延迟到首次判断工具名时再导入（导入会加载全部工具模块）
+_UNRESOLVED = object()
+_ToolRegistry: Any = _UNRESOLVED
 
 # engtools 注册表不可用时兜底识别的工具名
 _FALLBACK_KNOWN_TOOLS = {
@@ -24,16 +24,98 @@ _FALLBACK_KNOWN_TOOLS = {
 }
 
 
+def _get_tool_registry() -> Any:
+    """返回 engtools.ToolRegistry；不可用时为 None，结果在进程内缓存。"""
+    global _ToolRegistry
+    if _ToolRegistry is _UNRESOLVED:
+        try:
+            from engtools import ToolRegistry as registry
+        except Exception:
+            registry = None
+        _ToolRegistry = registry
+    return _ToolRegistry
+
+
 def _is_known_tool(tool_name: str) -> bool:
     """判断工具名在运行时是否可执行（注册表可用时以注册表为准）。"""
-    if _ToolRegistry is not None:
+    registry = _get_tool_registry()
+    if registry is not None:
         try:
-            return _ToolRegistry.get_tool(tool_name) is not None
+            return registry.get_tool(tool_name) is not None
         except Exception:
             pass
     return str(tool_name or "").strip().lower() in _FALLBACK_KNOWN_TOOLS
 
 
+# 步骤章节标题（允许行首缩进），用于截取 LLM 解析的正文起点
+_STEP_HEADER_RE = re.compile(r"^[ \t]*(?:## 实施步骤|## 步骤|## Steps|## Implementation|# Steps)", re.M)
+
+
+# 送入 LLM 解析的 SOP 正文最大字符数
+_STEP_CONTENT_CAP = 8000
+_READ_CHUNK_CHARS = 65536
+
+
+def _read_step_section(filepath: str, cap: int) -> str:
+    """流式读取 Markdown，返回步骤章节起（无章节标题时为文件开头）的至多 cap + 1 个字符。
+
+    按整行分块扫描章节标题，命中后只再读够 cap + 1 个字符即停止；
+    峰值内存与文件大小无关，调用方据返回长度判断是否需要截断。
+    """
+    head = ""
+    pending = ""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        while True:
+            chunk = f.read(_READ_CHUNK_CHARS)
+            if len(head) <= cap:
+                head += chunk[:cap + 1 - len(head)]
+            buffer = pending + chunk
+            # 仅扫描完整行，保证 ^ 锚点落在真实行首；EOF 时扫描剩余部分
+            cut = buffer.rfind("\n") + 1 if chunk else len(buffer)
+            scanned, pending = buffer[:cut], buffer[cut:]
+            header = _STEP_HEADER_RE.search(scanned)
+            if header:
+                section = scanned[header.start():] + pending
+                while len(section) <= cap and chunk:
+                    chunk = f.read(_READ_CHUNK_CHARS)
+                    section += chunk
+                return section[:cap + 1]
+            if not chunk:
+                return head
+
+
+def _extract_md_description(content: str, default: str, head_chars: int = 1000) -> str:
+    """从 Markdown 头部提取描述：首个正文行优先，否则取一级标题。
+
+    逐行惰性扫描前 head_chars 个字符，命中正文行即停止，不构造整段行列表。
+    """
+    description = default
+    for line in io.StringIO(content[:head_chars]):
+        line = line.strip()
+        if line and not line.startswith('#'):
+            return line
+        if line.startswith('# '):
+            description = line.lstrip('#').strip()
+    return description
+
+
+_INDEX_READ_WORKERS = 8
+
+
+def _load_json(path: str) -> Any:
+    """以字节读取并解析 JSON 文件（优先 orjson）；每次返回新对象，调用方可自由修改。"""
+    with open(path, 'rb') as f:
+        return load_json_bytes(f.read())
+
+
+def _read_json_file(path: str) -> Tuple[Any, Optional[Exception]]:
+    """读取并解析单个 JSON 文件，返回 (数据, 异常)，便于在线程池中批量读取。"""
+    try:
+        return _load_json(path), None
+    except Exception as e:
+        return None, e
+
+
 def _normalize_inline_description(value: Any) -> Dict[str, Any]:
     """将步骤描述规范化为 {content, citations[]} 结构。"""
     if isinstance(value, dict):
@@ -98,21 +180,55 @@ class SopLoader:
         self.raw_dir = os.path.join(sop_base_dir, "raw")
         self.index_file = os.path.join(sop_base_dir, "index.json")
         self.sops: List[SOP] = []
-        self.parser = SopParser()
+        self._sops_by_id: Dict[str, SOP] = {}
+        # SopParser 无实例状态（方法均为 static/classmethod），直接共享类对象
+        self.parser = SopParser
         self.load_errors: Dict[str, str] = {}
+        # 串行化 index.json 的增量回写（preparse_all 多线程场景）
+        self._index_lock = threading.Lock()
+        # 保护 load_errors / sops 等共享状态（preparse_all 并发调用 analyze_sop）
+        self._state_lock = threading.RLock()
+
+    def _json_path(self, sop_id: str) -> str:
+        """json/ 目录下 SOP 文件路径。"""
+        return os.path.join(self.json_dir, f"{sop_id}.json")
 
-    def load_all(self) -> List[SOP]:
-        """从索引文件加载 SOP 列表。如果索引不存在则自动生成。"""
+    def _scan_json_names(self) -> set:
+        """一次性列出 json/ 目录下的文件名，替代逐条 os.path.exists。"""
+        if not os.path.isdir(self.json_dir):
+            return set()
+        return set(os.listdir(self.json_dir))
+
+    def load_all(self, lazy_steps: bool = False) -> List[SOP]:
+        """从索引文件加载 SOP 列表。如果索引不存在则自动生成。
+
+        Args:
+            lazy_steps: 为 True 时，索引中带 blackboard 与完整描述的 json/ 来源 SOP 仅用索引元数据构建，
+                不打开各自的 JSON 文件，其 steps 为占位。返回的是独立列表，不写入 self.sops，
+                只适用于做意图路由的调用方；执行前须经 analyze_sop 取得完整 SOP。
+        """
         if not os.path.exists(self.index_file):
             print(f"SOP Index not found at {self.index_file}, generating...")
             self.refresh_index()
 
-        self.sops = self._load_from_index()
-        if any(s.blackboard is None for s in self.sops):
+        sops = self._load_from_index(lazy_steps)
+        if any(s.blackboard is None for s in sops):
             self.refresh_index()
-            self.sops = self._load_from_index()
+            sops = self._load_from_index(lazy_steps)
+        if lazy_steps:
+            return sops
+        self._set_sops(sops)
         return self.sops
 
+    def _set_sops(self, sops: List[SOP]) -> None:
+        """更新 SOP 列表并重建 id 索引（同 id 重复时保留首个，与线性查找一致）。"""
+        by_id: Dict[str, SOP] = {}
+        for sop in sops:
+            by_id.setdefault(sop.id, sop)
+        with self._state_lock:
+            self.sops = sops
+            self._sops_by_id = by_id
+
     def refresh_index(self):
         """生成或更新 index.json，优先扫描 json/ 目录，兼容 raw/ 目录。"""
         if not os.path.exists(self.sop_base_dir):
@@ -122,27 +238,28 @@ class SopLoader:
 
         # 主要数据源：json/ 目录下的所有 .json 文件
         if os.path.exists(self.json_dir):
-            json_files = glob.glob(os.path.join(self.json_dir, "*.json"))
-            for fpath in sorted(json_files):
+            json_files = sorted(glob.glob(os.path.join(self.json_dir, "*.json")))
+            # 文件读取在线程池中并发进行，结果按文件名顺序消费，索引顺序不变
+            with ThreadPoolExecutor(max_workers=max(1, min(_INDEX_READ_WORKERS, len(json_files)))) as executor:
+                loaded = list(executor.map(_read_json_file, json_files))
+            for fpath, (sop_data, read_error) in zip(json_files, loaded):
                 try:
-                    with open(fpath, 'r', encoding='utf-8') as f:
-                        sop_data = json.load(f)
+                    if read_error is not None:
+                        raise read_error
 
                     sop_id = sop_data.get("id", "")
                     if not sop_id:
                         sop_id = os.path.splitext(os.path.basename(fpath))[0]
 
-                    description = sop_data.get("description", f"SOP for {sop_id}")
-                    if len(description) > 200:
-                        description = description[:197] + "..."
-
+                    # 保留完整描述：惰性加载直接用索引条目参与路由，须与 json/ 文件一致
                     index_data.append({
                         "id": sop_id,
                         "name_zh": sop_data.get("name_zh", sop_id),
                         "name_en": sop_data.get("name_en", ""),
-                        "description": description,
+                        "description": sop_data.get("description", ""),
                         "blackboard": sop_data.get("blackboard"),
-                        "_source": "json"
+                        "_source": "json",
+                        "_full_description": True,
                     })
                 except Exception as e:
                     print(f"Error indexing JSON {fpath}: {e}")
@@ -160,18 +277,9 @@ class SopLoader:
                     if sop_id in existing_ids:
                         continue
 
-                    description = f"SOP for {sop_id}"
                     with open(fpath, 'r', encoding='utf-8') as f:
                         full_content = f.read()
-                        head_content = full_content[:1000]
-                        lines = head_content.split('\n')
-                        for line in lines:
-                            line = line.strip()
-                            if line and not line.startswith('#'):
-                                description = line
-                                break
-                            elif line.startswith('# '):
-                                description = line.lstrip('#').strip()
+                    description = _extract_md_description(full_content, f"SOP for {sop_id}")
 
                     blackboard = self.parser.extract_blackboard_from_markdown(full_content)
 
@@ -189,20 +297,41 @@ class SopLoader:
                 except Exception as e:
                     print(f"Error indexing MD {fpath}: {e}")
 
-        # 写入到根目录的 index.json
-        with open(self.index_file, 'w', encoding='utf-8') as f:
-            json.dump(index_data, f, indent=2, ensure_ascii=False)
+        # 写入到根目录的 index.json（临时文件 + 原子替换）
+        atomic_write_json(self.index_file, index_data)
         print(f"SOP Index generated with {len(index_data)} entries (json={sum(1 for e in index_data if e.get('_source')=='json')}, raw={sum(1 for e in index_data if e.get('_source')=='raw')}).")
 
-    def _load_from_index(self) -> List[SOP]:
+    def _sync_index_blackboard(self, sop_id: str, blackboard: Optional[Dict[str, Any]]) -> None:
+        """将单个 SOP 的 blackboard 回写到 index.json，使索引保持为全部 blackboard 的汇总缓存。
+
+        解析结果落盘到 json/ 后调用，免去整体 refresh_index 重扫所有文件；
+        惰性加载（lazy_steps）据此直接读取最新 blackboard。
+        """
+        if blackboard is None or not os.path.exists(self.index_file):
+            return
+        with self._index_lock:
+            try:
+                index_data = _load_json(self.index_file)
+                entries = index_data.get("sops", []) if isinstance(index_data, dict) else index_data
+                if not isinstance(entries, list):
+                    return
+                target = next((e for e in entries if isinstance(e, dict) and e.get("id") == sop_id), None)
+                if target is None or target.get("blackboard") == blackboard:
+                    return
+                # 每次读取都是新解析的对象，可直接原地修改后写回
+                target["blackboard"] = blackboard
+                atomic_write_json(self.index_file, index_data)
+            except Exception as e:
+                print(f"Error syncing blackboard of {sop_id} to index: {e}")
+
+    def _load_from_index(self, lazy_steps: bool = False) -> List[SOP]:
         """读取 index.json 并转换为 SOP 对象列表，根据来源类型选择加载策略。"""
         sops = []
         if not os.path.exists(self.index_file):
             return sops
 
         try:
-            with open(self.index_file, 'r', encoding='utf-8') as f:
-                index_data = json.load(f)
+            index_data = _load_json(self.index_file)
 
             # 兼容两种索引格式：refresh_index 产出的裸列表，以及生成器产出的 {"sops": [...]}
             if isinstance(index_data, dict):
@@ -210,6 +339,7 @@ class SopLoader:
             if not isinstance(index_data, list):
                 return sops
 
+            existing_json = self._scan_json_names()
             for entry in index_data:
                 if not isinstance(entry, dict):
                     continue
@@ -219,16 +349,19 @@ class SopLoader:
                 source = entry.get("_source")
                 if not source:
                     # 未标注来源时按 json/ 目录（唯一真相源）是否存在对应文件推断
-                    source = "json" if os.path.exists(os.path.join(self.json_dir, f"{sop_id}.json")) else "raw"
+                    source = "json" if f"{sop_id}.json" in existing_json else "raw"
 
                 if source == "json":
-                    sop = self._load_json_sop(sop_id)
+                    if lazy_steps and self._is_lazy_entry(entry, existing_json):
+                        sops.append(self._build_lazy_sop(entry))
+                        continue
+                    sop = self._load_json_sop(sop_id, existing_json)
                     if sop:
                         sops.append(sop)
                     continue
 
                 # raw/ 来源的 SOP（原有逻辑）
-                sop = self._load_raw_sop(entry)
+                sop = self._load_raw_sop(entry, existing_json)
                 if sop:
                     sops.append(sop)
 
@@ -237,16 +370,45 @@ class SopLoader:
 
         return sops
 
-    def _load_json_sop(self, sop_id: str) -> Optional[SOP]:
-        """从 json/ 目录加载完整的 SOP 对象（包含 steps 和 blackboard）。"""
-        json_path = os.path.join(self.json_dir, f"{sop_id}.json")
-        if not os.path.exists(json_path):
+    @staticmethod
+    def _is_lazy_entry(entry: Dict[str, Any], existing_json: set) -> bool:
+        """索引条目能否替代 json/ 文件参与路由：需带 blackboard 且描述未被截断（旧版索引会截断）。"""
+        return (
+            entry.get("blackboard") is not None
+            and entry.get("_full_description") is True
+            and f"{entry['id']}.json" in existing_json
+        )
+
+    def _build_lazy_sop(self, entry: Dict[str, Any]) -> SOP:
+        """仅用索引条目构建 SOP 路由对象（不读取 json/ 文件），路由字段与 _load_json_sop 一致。"""
+        sop_id = entry["id"]
+        return SOP(
+            id=sop_id,
+            name_zh=entry.get("name_zh", sop_id),
+            name_en=entry.get("name_en", ""),
+            description=entry.get("description", ""),
+            steps=[Step(id="execute_md", tool="auto")],
+            blackboard=entry.get("blackboard")
+        )
+
+    def _load_json_sop(self, sop_id: str, existing_json: Optional[set] = None) -> Optional[SOP]:
+        """从 json/ 目录加载完整的 SOP 对象（包含 steps 和 blackboard）。
+
+        Args:
+            sop_id: SOP 标识
+            existing_json: 预扫描的 json/ 文件名集合；为空时逐个检查文件是否存在
+        """
+        json_path = self._json_path(sop_id)
+        if existing_json is not None:
+            if f"{sop_id}.json" not in existing_json:
+                return None
+        elif not os.path.exists(json_path):
             return None
 
         try:
-            self.load_errors.pop(sop_id, None)
-            with open(json_path, 'r', encoding='utf-8') as f:
-                sop_data = json.load(f)
+            with self._state_lock:
+                self.load_errors.pop(sop_id, None)
+            sop_data = _load_json(json_path)
 
             steps_data = sop_data.get("steps", [])
             loaded_steps = []
@@ -264,7 +426,8 @@ class SopLoader:
             )
             return sop
         except Exception as e:
-            self.load_errors[sop_id] = str(e)
+            with self._state_lock:
+                self.load_errors[sop_id] = str(e)
             print(f"Error loading JSON SOP {sop_id}: {e}")
             return None
 
@@ -275,7 +438,7 @@ class SopLoader:
         *,
         overwrite: bool = False,
     ) -> str:
-        json_path = os.path.join(self.json_dir, f"{sop_id}.json")
+        json_path = self._json_path(sop_id)
         if os.path.exists(json_path) and not overwrite:
             raise FileExistsError(f"SOP {sop_id} already exists at {json_path}. Use overwrite=True to replace.")
 
@@ -293,13 +456,12 @@ class SopLoader:
                 normalized_steps.append(s)
             data["steps"] = normalized_steps
 
-        with open(json_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        atomic_write_json(json_path, data)
 
         self.refresh_index()
         return json_path
 
-    def _load_raw_sop(self, entry: Dict[str, Any]) -> Optional[SOP]:
+    def _load_raw_sop(self, entry: Dict[str, Any], existing_json: Optional[set] = None) -> Optional[SOP]:
         """从 raw/ 索引条目加载 SOP，并尝试用 json/ 中的缓存补充详情。"""
         sop_id = entry["id"]
 
@@ -323,12 +485,12 @@ class SopLoader:
             blackboard=entry.get("blackboard")
         )
 
-        # 尝试从 json/ 缓存加载详细步骤
-        json_path = os.path.join(self.json_dir, f"{sop_id}.json")
-        if os.path.exists(json_path):
+        # 尝试从 json/ 加载详细步骤
+        json_path = self._json_path(sop_id)
+        has_json = f"{sop_id}.json" in existing_json if existing_json is not None else os.path.exists(json_path)
+        if has_json:
             try:
-                with open(json_path, "r", encoding="utf-8") as jf:
-                    cached = json.load(jf)
+                cached = _load_json(json_path)
                 if cached.get("steps"):
                     loaded_steps = [Step(**_normalize_step_dict(s)) for s in cached.get("steps")]
                     sop.steps = loaded_steps
@@ -347,38 +509,37 @@ class SopLoader:
         1. 如果 SOP 来自 json/ 且已有完整 steps，直接返回（无需解析）。
         2. 如果 SOP 来自 raw/ 或需要刷新，走原有的 MD→LLM 解析流程。
         """
-        # 查找已加载的 SOP
-        if self.sops:
-            sop = next((s for s in self.sops if s.id == sop_id), None)
-        else:
-            sop = next((s for s in self.load_all() if s.id == sop_id), None)
+        # 查找已加载的 SOP（首次加载在锁内完成，避免并发调用重复加载）；
+        # 路由用的惰性列表每次从 index.json 读取，可能含首次加载后新增的 SOP，未命中时重载一次
+        with self._state_lock:
+            if not self.sops:
+                self.load_all()
+            sop = self._sops_by_id.get(sop_id)
+            if not sop:
+                self.load_all()
+                sop = self._sops_by_id.get(sop_id)
         if not sop:
             raise ValueError(f"SOP {sop_id} not found")
 
-        # 判断 SOP 来源
-        is_json_source = False
-        json_path = os.path.join(self.json_dir, f"{sop_id}.json")
-
+        # 判断 SOP 来源：json/ 文件只读取一次，后续分支复用
+        json_path = self._json_path(sop_id)
+        cached_data = None
         if os.path.exists(json_path):
             try:
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    cached = json.load(f)
-                if cached.get("steps") and len(cached.get("steps")) > 1:
-                    is_json_source = True
+                cached_data = _load_json(json_path)
             except Exception:
-                pass
+                cached_data = None
+        if not isinstance(cached_data, dict):
+            cached_data = None
+        is_json_source = bool(cached_data and cached_data.get("steps") and len(cached_data.get("steps")) > 1)
 
         # JSON 来源且已有完整步骤：直接返回
         if is_json_source and not force_refresh:
             try:
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    cached_data = json.load(f)
-                steps_data = cached_data.get("steps", [])
-                if steps_data:
-                    loaded_steps = [Step(**_normalize_step_dict(s)) for s in steps_data]
-                    sop.steps = loaded_steps
-                    sop.blackboard = cached_data.get("blackboard") or self.parser.build_blackboard_from_steps(loaded_steps)
-                    return sop
+                loaded_steps = [Step(**_normalize_step_dict(s)) for s in cached_data["steps"]]
+                sop.steps = loaded_steps
+                sop.blackboard = cached_data.get("blackboard") or self.parser.build_blackboard_from_steps(loaded_steps)
+                return sop
             except Exception as e:
                 print(f"[SOP Loader] Failed to load JSON SOP {sop_id}: {e}")
 
@@ -398,12 +559,10 @@ class SopLoader:
         file_mtime = os.path.getmtime(filepath)
 
         # 尝试从 JSON 缓存加载
-        if not force_refresh and os.path.exists(json_path):
+        if not force_refresh and cached_data is not None:
             json_mtime = os.path.getmtime(json_path)
             if json_mtime >= file_mtime:
                 try:
-                    with open(json_path, "r", encoding="utf-8") as jf:
-                        cached_data = json.load(jf)
                     steps_data = cached_data.get("steps", [])
                     if steps_data:
                         loaded_steps = [Step(**_normalize_step_dict(s)) for s in steps_data]
@@ -414,21 +573,12 @@ class SopLoader:
                     print(f"[SOP Loader] Cache load failed for {sop_id}: {e}, falling back to parser.")
 
         # LLM 解析流程
-        with open(filepath, 'r', encoding='utf-8') as f:
-            raw_content = f.read()
-        lines = raw_content.splitlines()
-        start_idx = 0
-        keywords = ["## 实施步骤", "## 步骤", "## Steps", "## Implementation", "# Steps"]
-        for i, ln in enumerate(lines):
-            if any(ln.strip().startswith(k) for k in keywords):
-                start_idx = i
-                break
-        content = "\n".join(lines[start_idx:]) if start_idx > 0 else raw_content
-        if len(content) > 8000:
-            content = content[:8000] + "\n...(内容已截断)"
+        content = _read_step_section(filepath, _STEP_CONTENT_CAP)
+        if len(content) > _STEP_CONTENT_CAP:
+            content = content[:_STEP_CONTENT_CAP] + "\n...(内容已截断)"
 
         if prefer_llm:
-            return self.parser.parse(
+            parsed = self.parser.parse(
                 sop=sop,
                 content=content,
                 filename=filename,
@@ -438,17 +588,33 @@ class SopLoader:
                 file_mtime=file_mtime,
                 json_path=json_path
             )
+            if save_to_json:
+                self._sync_index_blackboard(sop_id, parsed.blackboard)
+            return parsed
 
         if not sop.blackboard:
             sop.blackboard = self.parser.extract_blackboard_from_markdown(content)
 
         return sop
 
-    def preparse_all(self, config_name: str = None, mode: str = "instruct", force: bool = False) -> Dict[str, object]:
-        """批量预解析所有 SOP 并输出到 json/。"""
+    def preparse_all(self, config_name: str = None, mode: str = "instruct", force: bool = False, max_workers: int = 1) -> Dict[str, object]:
+        """批量预解析所有 SOP 并输出到 json/。
+
+        默认串行解析；max_workers > 1 时以线程池并发执行各 SOP 的 LLM 解析（网络 I/O 为主），
+        结果按 SOP 顺序汇总。并发度受 LLM 服务限流约束，需按供应商配额显式调大。
+
+        Args:
+            config_name: LLM 配置名
+            mode: LLM 调用模式
+            force: 是否忽略已有 JSON 缓存强制重新解析
+            max_workers: 并发解析的最大线程数（默认 1 即串行）
+        """
         sops = self.load_all()
         results = {"total": len(sops), "success": 0, "failed": 0, "items": []}
-        for sop in sops:
+        if not sops:
+            return results
+
+        def _preparse_one(sop: SOP) -> Dict[str, Any]:
             try:
                 analyzed = self.analyze_sop(
                     sop.id,
@@ -458,11 +624,14 @@ class SopLoader:
                     prefer_llm=True,
                     force_refresh=force
                 )
-                results["success"] += 1
-                results["items"].append({"id": sop.id, "steps": len(analyzed.steps)})
+                return {"id": sop.id, "steps": len(analyzed.steps)}
             except Exception as e:
-                results["failed"] += 1
-                results["items"].append({"id": sop.id, "error": str(e)})
+                return {"id": sop.id, "error": str(e)}
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(sops)))) as executor:
+            for item in executor.map(_preparse_one, sops):
+                results["failed" if "error" in item else "success"] += 1
+                results["items"].append(item)
         return results
 
 
@@ -473,6 +642,7 @@ def _run_preparse_from_cli():
     mode = "instruct"
     sop_id = None
     force = False
+    workers = 1
     args = sys.argv[1:]
     if args:
         sop_base_dir = args[0]
@@ -497,6 +667,13 @@ def _run_preparse_from_cli():
             force = True
             i += 1
             continue
+        if key == "--workers":
+            try:
+                workers = max(1, int(val))
+            except (TypeError, ValueError):
+                print(f"Invalid --workers value: {val}, using {workers}.")
+            i += 2
+            continue
         i += 1
     loader = SopLoader(sop_base_dir)
     if sop_id:
@@ -518,10 +695,10 @@ def _run_preparse_from_cli():
         print(json.dumps(result, ensure_ascii=False, indent=2))
         return
     if "--all" in sys.argv:
-        result = loader.preparse_all(config_name=config_name, mode=mode, force=force)
+        result = loader.preparse_all(config_name=config_name, mode=mode, force=force, max_workers=workers)
         print(json.dumps(result, ensure_ascii=False, indent=2))
         return
-    print("Please specify --sop <sop_id> to preparse a single SOP, or add --all to preparse all.")
+    print("Please specify --sop <sop_id> to preparse a single SOP, or add --all to preparse all (--workers <n> for concurrent LLM calls, default 1).")
 
 if __name__ == "__main__":
     _run_preparse_from_cli()
@@ -1,10 +1,21 @@
+import hashlib
 import json
+import math
 import re
 import os
+import uuid
 from typing import List, Dict, Any, Tuple
 from angineer_core.base_contracts import SOP, Step
 
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
 # ---------- 极简内联工具 ----------
+_JSON_DECODER = json.JSONDecoder()
+
+
 def _extract_json_from_text(text: str) -> Dict[str, Any]:
     """粗暴提取 ```json 包裹或裸 JSON。"""
     text = text.strip()
@@ -19,35 +30,10 @@ def _extract_json_from_text(text: str) -> Dict[str, Any]:
         pass
     start = raw.find("{")
     if start == -1:
-        raise
-    depth = 0
-    in_str = False
-    escape = False
-    last_ok = -1
-    for idx, ch in enumerate(raw[start:], start):
-        if in_str:
-            if escape:
-                escape = False
-                continue
-            if ch == "\\":
-                escape = True
-                continue
-            if ch == "\"":
-                in_str = False
-            continue
-        if ch == "\"":
-            in_str = True
-            continue
-        if ch == "{":
-            depth += 1
-        elif ch == "}":
-            depth -= 1
-            if depth == 0:
-                last_ok = idx
-                break
-    if last_ok != -1:
-        return json.loads(raw[start:last_ok + 1])
-    raise
+        raise ValueError("No JSON object found in LLM response")
+    # raw_decode 在 C 层解析首个完整对象并忽略其后的多余文本
+    obj, _end = _JSON_DECODER.raw_decode(raw, start)
+    return obj
 
 def _normalize_step_io(tool: str, inputs: Any, outputs: Any, file_name: str) -> Tuple[Dict, Dict]:
     """仅保证字段结构，模板全部交给 LLM。"""
@@ -70,10 +56,162 @@ def _normalize_step_io(tool: str, inputs: Any, outputs: Any, file_name: str) ->
         ins.setdefault("file_name", os.path.basename(file_name))
     return ins, outs
 
+# extract_blackboard_from_markdown 结果缓存：content 摘要 -> blackboard
+_MD_BLACKBOARD_CACHE: Dict[bytes, Dict[str, Any]] = {}
+_MD_BLACKBOARD_CACHE_MAX = 512
+
+
+def _copy_blackboard(blackboard: Dict[str, Any]) -> Dict[str, Any]:
+    """复制 blackboard 的列表字段，避免调用方修改缓存中的对象。"""
+    return {k: list(v) for k, v in blackboard.items()}
+
+
+# ${var} 上下文引用；排除 \x00 以免跨越 _collect_refs 拼接的叶子边界
+_REF_RE = re.compile(r"\$\{([^}\x00]+)\}")
+# Markdown **Outputs** 段落中的 `变量名`
+_BACKTICK_RE = re.compile(r"`([^`]+)`")
+
+
+def _iter_strings(value: Any):
+    """递归产出 dict/list 中的字符串叶子。"""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for v in value.values():
+            yield from _iter_strings(v)
+    elif isinstance(value, list):
+        for v in value:
+            yield from _iter_strings(v)
+
+
+def _collect_refs(value: Any) -> List[str]:
+    """拼接全部字符串叶子后单次正则扫描，提取 ${var} 引用名。"""
+    return _REF_RE.findall("\x00".join(_iter_strings(value)))
+
+
+def load_json_bytes(data: Any) -> Any:
+    """解析 JSON 文本/字节；安装了 orjson 时优先使用，失败再交给标准库（兼容历史文件中的 NaN/Infinity）。"""
+    if _orjson is not None:
+        try:
+            return _orjson.loads(data)
+        except _orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def _has_non_finite(value: Any) -> bool:
+    """递归检查是否含 NaN/Infinity（orjson 会将其静默写成 null）。"""
+    if isinstance(value, float):
+        return not math.isfinite(value)
+    if isinstance(value, dict):
+        return any(_has_non_finite(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(_has_non_finite(v) for v in value)
+    return False
+
+
+def _json_dumps_bytes(data: Any) -> bytes:
+    """序列化为 2 空格缩进的 UTF-8 JSON 字节；安装了 orjson 时优先使用。
+
+    orjson 无法编码的值（如超过 64 位的整数）及 NaN/Infinity 交给标准库，
+    与 load_json_bytes 的回退对应，保证读写往返不改变数据。
+    """
+    if _orjson is not None:
+        try:
+            payload = _orjson.dumps(data, option=_orjson.OPT_INDENT_2 | _orjson.OPT_NON_STR_KEYS)
+        except _orjson.JSONEncodeError:
+            payload = None
+        # 仅当输出含 null 时才需要排查是否由非有限浮点数转换而来
+        if payload is not None and not (b"null" in payload and _has_non_finite(data)):
+            return payload
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def atomic_write_json(path: str, data: Any) -> None:
+    """一次序列化后经 64KB 缓冲写临时文件，再原子替换目标，避免写一半被读到。"""
+    payload = _json_dumps_bytes(data)
+    try:
+        mode = os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        mode = None
+    tmp_path = os.path.join(os.path.dirname(path) or ".", f".{os.path.basename(path)}.{uuid.uuid4().hex}.tmp")
+    # 以 0666 独占创建临时文件，由内核套用当前 umask（不修改进程级 umask）
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o666)
+    try:
+        with os.fdopen(fd, "wb", buffering=65536) as f:
+            f.write(payload)
+        # 覆盖已有文件时沿用其权限
+        if mode is not None:
+            os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
 def _compact_dict(data: Dict[str, Any]) -> Dict[str, Any]:
     """移除字典中值为 None 的字段。"""
     return {k: v for k, v in data.items() if v is not None}
 
+
+# LLM 一次性解析 SOP 的系统提示词（模块级常量，避免每次解析重建）
+_PARSE_SYSTEM_PROMPT = """
+You are an expert System Analyst. Your goal is to convert a Markdown Standard Operating Procedure (SOP) into a structured JSON execution plan.
+Input: A Markdown SOP document containing Steps.
+Output: A JSON object with a "steps" list. Output ONLY a valid JSON object, no markdown or extra text. Do not include line breaks inside any JSON string value.
+- "id": A short, unique identifier (e.g., "step_1", "calc_width").
+- "name": The step title.
+- "description": A summary of what to do.
+- "tool": The best tool for this step. Options: "calculator" (for math), "knowledge_search" (for looking up specs), "table_lookup" (for structured table queries), "user_input" (ask user), or "auto" (let dispatcher decide).
+  - PRIORITY: Use "table_lookup" if the step mentions "Table", "Chart", "表", or "图".
+  - STRICTLY FORBIDDEN: Do NOT use "knowledge_search" if a table name is mentioned (e.g. "Table A.0.1", "图 6.4.6-1"). Use "table_lookup" instead.
+- "inputs": A dictionary of required input parameters for this step. keys are parameter names, values are descriptions or context references.
+  - For table_lookup, inputs must include "table_name", "query_conditions" (dict), "file_name" (document title, e.g. "海港总体设计规范_JTS_165-2025"), and optionally "target_column" (the column name to read).
+  - For knowledge_search, inputs must include "query" (the search question or keyword) and "file_name" (document title, optional).
+  - Guidelines for conditional (conditional branching):
+  - Use when step requires different actions based on condition variable value (e.g. ship type, material type).
+  - Input structure:
+    ```json
+    {
+      "tool": "conditional",
+      "inputs": {
+        "condition_var": "${ship_type}",
+        "branches": [
+          {"match": ["杂货船", "集装箱船", "其他船型"], "value": 0},
+          {"match": ["干散货船", "液体散货船"], "value": 0.15},
+          {"match": "滚装船", "table_lookup": {"table_name": "表5.4.12-2", "query_conditions": {"船型": "${ship_type}"}, "file_name": "海港总体设计规范_JTS_165-2025"}}
+        ],
+        "default": 0
+      }
+    }
+    ```
+  - "match": can be a single value or list of values
+  - "value": fixed return value
+  - "table_lookup": execute table lookup if matched
+  - "calculator": execute calculation if matched
+  - "default": default value if no branch matches
+- For calculator, inputs must include "expression" (a mathematical expression using ${variable} references).
+- "outputs": A dictionary mapping context keys to tool output paths.
+  - Format: {"Variable_Name": "result"}. Example: {"T": "result"}, {"Z0": "result"}.
+  - DO NOT use {"result": "Variable_Name"}.
+- "notes": CRITICAL. Extract any "Note", "Warning", "Attention", or conditional logic (e.g., "If soft soil, use lower value"). If none, leave empty.
+Guidelines for table_lookup:
+- Derive table_name from the mentioned 表/图编号.
+- Build query_conditions as a dict using condition keywords in the step text.
+- Use ${} to reference context variables, e.g. "吨级": "${dwt}", "船型": "${船型}", "航速": "${nav_speed_kn}", "水深": "${water_depth}", "土质": "${bottom_material}", "水域条件": "${navigation_area}".
+- Infer target_column from the step objective (e.g. "获取设计船型满载吃水 T" -> target_column="满载吃水 T" or "T").
+Guidelines for calculator:
+- Extract the formula from the description.
+- Convert variable names to ${} references (e.g., "D0 = T + Z0" -> "${T} + ${Z0}").
+- For outputs mapping:
+- For table_lookup and calculator: map target variables to "result", e.g. {"T": "result"}.
+- For user_input: map to "input" (NOT "input_value"), e.g. {"H_nav": "input"} or {"Z3": "0.15"} for fixed values.
+"""
+
+
 class SopParser:
     """
     SOP 解析器，负责将 Markdown 内容转换为结构化 Step 对象。
@@ -82,7 +220,19 @@ class SopParser:
 
     @staticmethod
     def extract_blackboard_from_markdown(content: str) -> Dict[str, Any]:
-        refs = set(re.findall(r"\$\{([^}]+)\}", content or ""))
+        """从 Markdown 中提取 blackboard，按内容摘要缓存以避免同一文档重复扫描。"""
+        digest = hashlib.blake2b((content or "").encode("utf-8"), digest_size=16).digest()
+        cached = _MD_BLACKBOARD_CACHE.get(digest)
+        if cached is None:
+            cached = SopParser._scan_blackboard_from_markdown(content)
+            if len(_MD_BLACKBOARD_CACHE) >= _MD_BLACKBOARD_CACHE_MAX:
+                _MD_BLACKBOARD_CACHE.clear()
+            _MD_BLACKBOARD_CACHE[digest] = cached
+        return _copy_blackboard(cached)
+
+    @staticmethod
+    def _scan_blackboard_from_markdown(content: str) -> Dict[str, Any]:
+        refs = set(_REF_RE.findall(content or ""))
         outputs = set()
         in_outputs = False
         for line in (content or "").splitlines():
@@ -93,7 +243,7 @@ class SopParser:
             if "**Inputs**" in line_str or "**Tool**" in line_str or line_str.startswith("###"):
                 in_outputs = False
             if in_outputs:
-                for name in re.findall(r"`([^`]+)`", line_str):
+                for name in _BACKTICK_RE.findall(line_str):
                     if name:
                         outputs.add(name)
         required = {r for r in refs if r and r not in outputs and r != "user_query"}
@@ -108,21 +258,9 @@ class SopParser:
         required = set()
         produced = set()
 
-        def collect_refs(value: Any):
-            if isinstance(value, str):
-                for name in re.findall(r"\$\{([^}]+)\}", value):
-                    if name:
-                        yield name
-            elif isinstance(value, dict):
-                for v in value.values():
-                    yield from collect_refs(v)
-            elif isinstance(value, list):
-                for v in value:
-                    yield from collect_refs(v)
-
         for step in steps or []:
             inputs = step.get("inputs") or {}
-            for name in collect_refs(inputs):
+            for name in _collect_refs(inputs):
                 if name not in produced:
                     required.add(name)
             outputs = step.get("outputs") or {}
@@ -140,21 +278,9 @@ class SopParser:
         required = set()
         produced = set()
 
-        def collect_refs(value: Any):
-            if isinstance(value, str):
-                for name in re.findall(r"\$\{([^}]+)\}", value):
-                    if name:
-                        yield name
-            elif isinstance(value, dict):
-                for v in value.values():
-                    yield from collect_refs(v)
-            elif isinstance(value, list):
-                for v in value:
-                    yield from collect_refs(v)
-
         for step in steps or []:
             inputs = step.inputs or {}
-            for name in collect_refs(inputs):
+            for name in _collect_refs(inputs):
                 if name not in produced:
                     required.add(name)
             outputs = step.outputs or {}
@@ -179,79 +305,25 @@ class SopParser:
                 serialized_steps.append(step.model_dump(exclude_none=True))
             else:
                 serialized_steps.append({k: v for k, v in step.dict().items() if v is not None})
-        with open(json_path, "w", encoding="utf-8") as f:
-            json.dump(
-                _compact_dict({
-                    "id": sop.id,
-                    "description": sop.description,
-                    "mtime": file_mtime,
-                    "steps": serialized_steps,
-                    "blackboard": sop.blackboard
-                }),
-                f,
-                indent=2,
-                ensure_ascii=False
-            )
-
-    def parse(self, sop: SOP, content: str, filename: str, config_name: str = None, mode: str = "instruct", save_to_json: bool = False, file_mtime: float = 0, json_path: str = None) -> SOP:
+        atomic_write_json(
+            json_path,
+            _compact_dict({
+                "id": sop.id,
+                "description": sop.description,
+                "mtime": file_mtime,
+                "steps": serialized_steps,
+                "blackboard": sop.blackboard
+            }),
+        )
+
+    @classmethod
+    def parse(cls, sop: SOP, content: str, filename: str, config_name: str = None, mode: str = "instruct", save_to_json: bool = False, file_mtime: float = 0, json_path: str = None) -> SOP:
         """
         利用 LLM 解析 SOP 内容。
         """
         # 一次性让 LLM 出完整 JSON
-        system = """
-You are an expert System Analyst. Your goal is to convert a Markdown Standard Operating Procedure (SOP) into a structured JSON execution plan.
-Input: A Markdown SOP document containing Steps.
-Output: A JSON object with a "steps" list. Output ONLY a valid JSON object, no markdown or extra text. Do not include line breaks inside any JSON string value.
-- "id": A short, unique identifier (e.g., "step_1", "calc_width").
-- "name": The step title.
-- "description": A summary of what to do.
-- "tool": The best tool for this step. Options: "calculator" (for math), "knowledge_search" (for looking up specs), "table_lookup" (for structured table queries), "user_input" (ask user), or "auto" (let dispatcher decide).
-  - PRIORITY: Use "table_lookup" if the step mentions "Table", "Chart", "表", or "图".
-  - STRICTLY FORBIDDEN: Do NOT use "knowledge_search" if a table name is mentioned (e.g. "Table A.0.1", "图 6.4.6-1"). Use "table_lookup" instead.
-- "inputs": A dictionary of required input parameters for this step. keys are parameter names, values are descriptions or context references.
-  - For table_lookup, inputs must include "table_name", "query_conditions" (dict), "file_name" (document title, e.g. "海港总体设计规范_JTS_165-2025"), and optionally "target_column" (the column name to read).
-  - For knowledge_search, inputs must include "query" (the search question or keyword) and "file_name" (document title, optional).
-  - Guidelines for conditional (conditional branching):
-  - Use when step requires different actions based on condition variable value (e.g. ship type, material type).
-  - Input structure:
-    ```json
-    {
-      "tool": "conditional",
-      "inputs": {
-        "condition_var": "${ship_type}",
-        "branches": [
-          {"match": ["杂货船", "集装箱船", "其他船型"], "value": 0},
-          {"match": ["干散货船", "液体散货船"], "value": 0.15},
-          {"match": "滚装船", "table_lookup": {"table_name": "表5.4.12-2", "query_conditions": {"船型": "${ship_type}"}, "file_name": "海港总体设计规范_JTS_165-2025"}}
-        ],
-        "default": 0
-      }
-    }
-    ```
-  - "match": can be a single value or list of values
-  - "value": fixed return value
-  - "table_lookup": execute table lookup if matched
-  - "calculator": execute calculation if matched
-  - "default": default value if no branch matches
-- For calculator, inputs must include "expression" (a mathematical expression using ${variable} references).
-- "outputs": A dictionary mapping context keys to tool output paths.
-  - Format: {"Variable_Name": "result"}. Example: {"T": "result"}, {"Z0": "result"}.
-  - DO NOT use {"result": "Variable_Name"}.
-- "notes": CRITICAL. Extract any "Note", "Warning", "Attention", or conditional logic (e.g., "If soft soil, use lower value"). If none, leave empty.
-Guidelines for table_lookup:
-- Derive table_name from the mentioned 表/图编号.
-- Build query_conditions as a dict using condition keywords in the step text.
-- Use ${} to reference context variables, e.g. "吨级": "${dwt}", "船型": "${船型}", "航速": "${nav_speed_kn}", "水深": "${water_depth}", "土质": "${bottom_material}", "水域条件": "${navigation_area}".
-- Infer target_column from the step objective (e.g. "获取设计船型满载吃水 T" -> target_column="满载吃水 T" or "T").
-Guidelines for calculator:
-- Extract the formula from the description.
-- Convert variable names to ${} references (e.g., "D0 = T + Z0" -> "${T} + ${Z0}").
-- For outputs mapping:
-- For table_lookup and calculator: map target variables to "result", e.g. {"T": "result"}.
-- For user_input: map to "input" (NOT "input_value"), e.g. {"H_nav": "input"} or {"Z3": "0.15"} for fixed values.
-"""
         messages = [
-            {"role": "system", "content": system},
+            {"role": "system", "content": _PARSE_SYSTEM_PROMPT},
             {"role": "user", "content": f"SOP Content:\n{content}"}
         ]
         try:
@@ -272,16 +344,16 @@ Guidelines for calculator:
                     analysis_status="analyzed",
                 ))
             if llm_steps:
-                sop.blackboard = self.build_blackboard_from_steps(llm_steps)
+                sop.blackboard = cls.build_blackboard_from_steps(llm_steps)
                 sop.steps = llm_steps
                 if save_to_json and json_path:
-                    self.save_sop_json(sop, file_mtime, json_path, llm_steps)
+                    cls.save_sop_json(sop, file_mtime, json_path, llm_steps)
                 return sop
         except Exception as e:
             print(f"[LLM 一次性解析失败，改用兜底]: {e}")
             pass
 
         if not sop.blackboard:
-            sop.blackboard = self.extract_blackboard_from_markdown(content)
+            sop.blackboard = cls.extract_blackboard_from_markdown(content)
 
         return sop
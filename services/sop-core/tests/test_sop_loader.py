@@ -0,0 +1,130 @@
+"""SopLoader 惰性/全量加载一致性与重复加载语义测试。"""
+import json
+import os
+
+import pytest
+
+from angineer_core.classifier import _build_sop_corpus, _keyword_recall
+from sop_core.sop_loader import SopLoader
+from sop_core.sop_parser import atomic_write_json
+
+
+LONG_DESCRIPTION = "计算港口航道通航宽度与水深，" * 30
+
+
+def _write_sop(json_dir, sop_id, name_zh, description, required, step_count=1):
+    """在 json/ 下写入一个结构化 SOP。"""
+    data = {
+        "id": sop_id,
+        "name_zh": name_zh,
+        "name_en": sop_id.replace("_", " "),
+        "description": description,
+        "steps": [
+            {"id": f"step{i}", "name_zh": "读取参数", "tool": "auto", "outputs": {"result": "结果"}}
+            for i in range(1, step_count + 1)
+        ],
+        "blackboard": {"required": required, "outputs": ["结果"]},
+    }
+    with open(os.path.join(json_dir, f"{sop_id}.json"), "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+
+
+@pytest.fixture
+def sop_dir(tmp_path):
+    """构建包含两个 json/ SOP 的临时目录（其一描述超过 200 字）。"""
+    json_dir = tmp_path / "json"
+    json_dir.mkdir()
+    _write_sop(str(json_dir), "channel_width", "航道宽度计算", LONG_DESCRIPTION, ["船舶吨级", "航速"])
+    _write_sop(str(json_dir), "berth_length", "泊位长度计算", "计算码头泊位长度", ["船长"])
+    return str(tmp_path)
+
+
+def _routing_fields(sops):
+    return [(s.id, s.name_zh, s.name_en, s.description, s.blackboard) for s in sops]
+
+
+def test_lazy_and_eager_routing_parity(sop_dir):
+    """惰性加载的路由字段与全量加载一致，长描述不被截断。"""
+    eager = SopLoader(sop_dir).load_all()
+    lazy = SopLoader(sop_dir).load_all(lazy_steps=True)
+
+    assert _routing_fields(lazy) == _routing_fields(eager)
+    assert next(s for s in lazy if s.id == "channel_width").description == LONG_DESCRIPTION
+
+    query = "五万吨级船舶的航道宽度怎么算"
+    assert _keyword_recall(query, *_build_sop_corpus(lazy)) == _keyword_recall(query, *_build_sop_corpus(eager))
+
+
+def test_lazy_load_does_not_replace_shared_sops(sop_dir):
+    """惰性结果只返回给调用方，不写入 loader.sops。"""
+    loader = SopLoader(sop_dir)
+    eager = loader.load_all()
+    lazy = loader.load_all(lazy_steps=True)
+
+    assert loader.sops is eager
+    assert all(s.steps[0].id == "step1" for s in loader.sops)
+    assert all(s.steps[0].id == "execute_md" for s in lazy)
+
+
+def test_legacy_index_without_full_description_falls_back_to_json(sop_dir):
+    """旧版索引（描述截断、无 _full_description 标记）时惰性加载改读 json/ 文件。"""
+    loader = SopLoader(sop_dir)
+    loader.refresh_index()
+    with open(loader.index_file, encoding="utf-8") as f:
+        entries = json.load(f)
+    for entry in entries:
+        entry.pop("_full_description", None)
+        if len(entry["description"]) > 200:
+            entry["description"] = entry["description"][:197] + "..."
+    atomic_write_json(loader.index_file, entries)
+
+    lazy = SopLoader(sop_dir).load_all(lazy_steps=True)
+
+    assert next(s for s in lazy if s.id == "channel_width").description == LONG_DESCRIPTION
+    assert all(s.steps[0].id == "step1" for s in lazy)
+
+
+def test_reload_returns_independent_objects(sop_dir):
+    """修改已加载 SOP 的嵌套数据不影响后续加载结果。"""
+    loader = SopLoader(sop_dir)
+    first = next(s for s in loader.load_all() if s.id == "channel_width")
+    first.blackboard["required"].append("污染")
+    first.steps[0].outputs["extra"] = "污染"
+
+    second = next(s for s in loader.load_all() if s.id == "channel_width")
+
+    assert second.blackboard["required"] == ["船舶吨级", "航速"]
+    assert "extra" not in second.steps[0].outputs
+
+
+def test_reload_reads_changed_file(sop_dir):
+    """json/ 文件内容变化后再次加载读到新数据。"""
+    loader = SopLoader(sop_dir)
+    assert next(s for s in loader.load_all() if s.id == "berth_length").description == "计算码头泊位长度"
+
+    _write_sop(os.path.join(sop_dir, "json"), "berth_length", "泊位长度计算", "计算码头泊位长度（更新版）", ["船长"])
+
+    assert next(s for s in loader.load_all() if s.id == "berth_length").description == "计算码头泊位长度（更新版）"
+
+
+def test_analyze_sop_finds_sop_added_after_first_load(sop_dir):
+    """首次全量加载后新增的 SOP：惰性路由可见，analyze_sop 也能取到。"""
+    loader = SopLoader(sop_dir)
+    loader.load_all()
+
+    # 模拟其他进程/路由写入新 SOP 并刷新索引
+    _write_sop(os.path.join(sop_dir, "json"), "anchorage_area", "锚地面积计算", "计算锚地水域面积", ["锚泊方式"], step_count=2)
+    SopLoader(sop_dir).refresh_index()
+
+    assert "anchorage_area" in [s.id for s in loader.load_all(lazy_steps=True)]
+    sop = loader.analyze_sop("anchorage_area", prefer_llm=False)
+    assert sop.id == "anchorage_area"
+    assert sop.name_zh == "锚地面积计算"
+    assert [step.id for step in sop.steps] == ["step1", "step2"]
+
+
+def test_analyze_sop_unknown_id_still_raises(sop_dir):
+    """重载后仍不存在的 SOP 照常报错。"""
+    loader = SopLoader(sop_dir)
+    with pytest.raises(ValueError):
+        loader.analyze_sop("missing_sop", prefer_llm=False)
@@ -0,0 +1,56 @@
+"""sop_parser JSON 读写辅助函数测试。"""
+import json
+import os
+import stat
+
+import pytest
+
+from sop_core.sop_parser import atomic_write_json, load_json_bytes
+
+
+posix_only = pytest.mark.skipif(os.name != "posix", reason="文件权限位仅在 POSIX 上有意义")
+
+
+def _mode(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+@posix_only
+def test_atomic_write_new_file_applies_umask(tmp_path):
+    """新文件按 0666 & ~umask 创建，写入后不残留临时文件。"""
+    path = tmp_path / "index.json"
+    old_umask = os.umask(0o027)
+    try:
+        atomic_write_json(str(path), [{"id": "a"}])
+    finally:
+        os.umask(old_umask)
+
+    assert _mode(path) == 0o640
+    assert load_json_bytes(path.read_bytes()) == [{"id": "a"}]
+    assert os.listdir(tmp_path) == ["index.json"]
+
+
+@posix_only
+def test_atomic_write_keeps_existing_mode(tmp_path):
+    """覆盖已有文件时沿用其权限。"""
+    path = tmp_path / "index.json"
+    path.write_text("[]", encoding="utf-8")
+    os.chmod(path, 0o600)
+
+    atomic_write_json(str(path), {"sops": []})
+
+    assert _mode(path) == 0o600
+    assert json.loads(path.read_text(encoding="utf-8")) == {"sops": []}
+
+
+def test_atomic_write_round_trips_big_int_and_non_finite(tmp_path):
+    """超 64 位整数与 NaN/Infinity 写入后再读取保持原值（不被改写为 null 或报错）。"""
+    path = tmp_path / "sop.json"
+    data = {"id": "big", "values": [2 ** 70, float("inf"), float("-inf")], "ratio": float("nan"), "note": None}
+
+    atomic_write_json(str(path), data)
+    loaded = load_json_bytes(path.read_bytes())
+
+    assert loaded["values"] == [2 ** 70, float("inf"), float("-inf")]
+    assert loaded["ratio"] != loaded["ratio"]
+    assert loaded["note"] is None